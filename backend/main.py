@@ -1,33 +1,55 @@
 """FastAPI backend for Time Series Dashboard."""
 
-from typing import Optional
-
+import functools
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, Optional
+
+import numpy as np
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import BackgroundTasks, FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import BaseModel, model_validator
 
 from services import (
     fetch_yahoo_data,
     list_databases,
     list_series,
-    fetch_haver_data,
+    fetch_haver_data_bytes,
     fetch_crypto_data,
     list_popular_cryptos,
     fetch_forex_data,
     list_popular_forex_pairs,
     search_time_series_event,
     run_backtest,
+    close_backtest_client,
+    close_parallel_client,
+    close_openai_client,
     search_critical_events,
 )
 
 # Load environment variables
 load_dotenv()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Release shared API clients on shutdown."""
+    yield
+    await close_backtest_client()
+    await close_parallel_client()
+    await close_openai_client()
+
+
 app = FastAPI(
     title="Time Series Dashboard API",
     description="API for fetching financial and macroeconomic time series data",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # CORS middleware for frontend
@@ -40,6 +62,93 @@ app.add_middleware(
 )
 
 
+# Response cache policies (seconds)
+CACHE_SHORT = 300
+CACHE_LONG = 3600
+RESPONSE_CACHE_MAX_ENTRIES = 1024
+
+_response_cache: "OrderedDict[tuple, tuple[float, Any]]" = OrderedDict()
+
+
+def cached_response(expire: int):
+    """
+    Cache the result of a read-only endpoint in process memory.
+    
+    Entries are keyed by endpoint name and arguments and served for
+    `expire` seconds. If a refresh fails with a server error, the last
+    cached copy is served instead, even when it has expired.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = (func.__name__, args, tuple(sorted(kwargs.items())))
+            entry = _response_cache.get(key)
+            now = time.monotonic()
+            if entry is not None and now - entry[0] < expire:
+                _response_cache.move_to_end(key)
+                return entry[1]
+            
+            try:
+                result = await func(*args, **kwargs)
+            except HTTPException as e:
+                if entry is not None and e.status_code >= 500:
+                    return entry[1]
+                raise
+            
+            _response_cache[key] = (now, result)
+            _response_cache.move_to_end(key)
+            while len(_response_cache) > RESPONSE_CACHE_MAX_ENTRIES:
+                _response_cache.popitem(last=False)
+            return result
+        return wrapper
+    return decorator
+
+
+# Background jobs for long-running search endpoints, kept for this long
+# after they finish so clients can still collect the result
+JOB_TTL_SECONDS = 3600
+
+_jobs: dict[str, dict[str, Any]] = {}
+
+
+def create_job() -> str:
+    """Register a pending job and return its id."""
+    now = time.monotonic()
+    expired = [
+        k for k, v in _jobs.items()
+        if v["finished_at"] is not None and now - v["finished_at"] > JOB_TTL_SECONDS
+    ]
+    for job_id in expired:
+        del _jobs[job_id]
+    
+    job_id = uuid.uuid4().hex
+    _jobs[job_id] = {
+        "job_id": job_id,
+        "status": "pending",
+        "result": None,
+        "error": None,
+        "created_at": now,
+        "finished_at": None,
+    }
+    return job_id
+
+
+async def run_job(job_id: str, error_prefix: str, func, **kwargs):
+    """Run a service coroutine and store its outcome on the job."""
+    job = _jobs[job_id]
+    try:
+        job["result"] = await func(**kwargs)
+        job["status"] = "completed"
+    except ValueError as e:
+        job["error"] = str(e)
+        job["status"] = "failed"
+    except Exception as e:
+        job["error"] = f"{error_prefix}: {str(e)}"
+        job["status"] = "failed"
+    finally:
+        job["finished_at"] = time.monotonic()
+
+
 # Request/Response Models
 class SearchRequest(BaseModel):
     """Request model for time series search."""
@@ -59,6 +168,16 @@ class BacktestRequest(BaseModel):
     values: list[float]
     start_date: str
     end_date: str
+    
+    _timestamps_np: Optional[np.ndarray] = None
+    _values_np: Optional[np.ndarray] = None
+    
+    @model_validator(mode="after")
+    def _coerce_series(self) -> "BacktestRequest":
+        """Convert the series to NumPy arrays once, at the request boundary."""
+        self._timestamps_np = np.asarray(self.timestamps, dtype="datetime64[ns]")
+        self._values_np = np.asarray(self.values, dtype=np.float64)
+        return self
 
 
 class CriticalEventsRequest(BaseModel):
@@ -79,6 +198,7 @@ async def health_check():
 
 # Yahoo Finance endpoints
 @app.get("/api/yahoo/{ticker}")
+@cached_response(CACHE_SHORT)
 async def get_yahoo_data(
     ticker: str,
     start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
@@ -93,7 +213,7 @@ async def get_yahoo_data(
     """
     try:
         data = await fetch_yahoo_data(ticker, start_date, end_date)
-        return data
+        return ORJSONResponse(data.model_dump())
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -102,6 +222,7 @@ async def get_yahoo_data(
 
 # Crypto endpoints
 @app.get("/api/crypto/popular")
+@cached_response(CACHE_LONG)
 async def get_popular_cryptos():
     """
     List popular cryptocurrencies.
@@ -116,6 +237,7 @@ async def get_popular_cryptos():
 
 
 @app.get("/api/crypto/{ticker}")
+@cached_response(CACHE_SHORT)
 async def get_crypto_data(
     ticker: str,
     start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
@@ -130,7 +252,7 @@ async def get_crypto_data(
     """
     try:
         data = await fetch_crypto_data(ticker, start_date, end_date)
-        return data
+        return ORJSONResponse(data.model_dump())
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -139,6 +261,7 @@ async def get_crypto_data(
 
 # Forex endpoints
 @app.get("/api/forex/popular")
+@cached_response(CACHE_LONG)
 async def get_popular_forex_pairs():
     """
     List popular forex pairs.
@@ -153,6 +276,7 @@ async def get_popular_forex_pairs():
 
 
 @app.get("/api/forex/{pair}")
+@cached_response(CACHE_SHORT)
 async def get_forex_data(
     pair: str,
     start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
@@ -167,7 +291,7 @@ async def get_forex_data(
     """
     try:
         data = await fetch_forex_data(pair, start_date, end_date)
-        return data
+        return ORJSONResponse(data.model_dump())
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -176,6 +300,7 @@ async def get_forex_data(
 
 # Haver Analytics endpoints
 @app.get("/api/haver/databases")
+@cached_response(CACHE_LONG)
 async def get_haver_databases():
     """
     List all available Haver databases.
@@ -192,6 +317,7 @@ async def get_haver_databases():
 
 
 @app.get("/api/haver/series/{database}")
+@cached_response(CACHE_LONG)
 async def get_haver_series(database: str):
     """
     List all series in a Haver database.
@@ -208,6 +334,7 @@ async def get_haver_series(database: str):
 
 
 @app.get("/api/haver/{database}/{series}")
+@cached_response(CACHE_LONG)
 async def get_haver_data(database: str, series: str):
     """
     Fetch time series data from Haver Analytics.
@@ -216,8 +343,9 @@ async def get_haver_data(database: str, series: str):
     - **series**: Series name (e.g., N997CE)
     """
     try:
-        data = await fetch_haver_data(database, series)
-        return data
+        # Pre-serialized from the arrays to skip list building and validation
+        content = await fetch_haver_data_bytes(database, series)
+        return Response(content=content, media_type="application/json")
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -226,26 +354,27 @@ async def get_haver_data(database: str, series: str):
 
 # Search endpoint
 @app.post("/api/search")
-async def search_event(request: SearchRequest):
+async def search_event(request: SearchRequest, background_tasks: BackgroundTasks):
     """
     Search for explanation of time series movement.
     
     Uses Parallel API to search the web for events that explain
     why a stock or economic indicator changed during a specific period.
+    Returns a job id immediately; poll /api/jobs/{job_id} for the result.
     """
-    try:
-        result = await search_time_series_event(
-            ticker=request.ticker,
-            query=request.query,
-            start_date=request.start_date,
-            end_date=request.end_date,
-            change_description=request.change_description,
-        )
-        return result
-    except ValueError as e:
-        raise HTTPException(status_code=401, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
+    job_id = create_job()
+    background_tasks.add_task(
+        run_job,
+        job_id,
+        "Search failed",
+        search_time_series_event,
+        ticker=request.ticker,
+        query=request.query,
+        start_date=request.start_date,
+        end_date=request.end_date,
+        change_description=request.change_description,
+    )
+    return {"job_id": job_id, "status": "pending"}
 
 
 # Backtest endpoint
@@ -260,8 +389,8 @@ async def backtest(request: BacktestRequest):
     try:
         result = await run_backtest(
             ticker=request.ticker,
-            timestamps=request.timestamps,
-            values=request.values,
+            timestamps=request._timestamps_np,
+            values=request._values_np,
             start_date=request.start_date,
             end_date=request.end_date,
         )
@@ -274,29 +403,53 @@ async def backtest(request: BacktestRequest):
 
 # Critical Events endpoint
 @app.post("/api/critical-events")
-async def get_critical_events(request: CriticalEventsRequest):
+async def get_critical_events(request: CriticalEventsRequest, background_tasks: BackgroundTasks):
     """
     Search for critical events in a time series.
     
     Finds the most important events, news, or developments related to
     the ticker during the specified time period.
+    Returns a job id immediately; poll /api/jobs/{job_id} for the result.
     """
-    try:
-        result = await search_critical_events(
-            ticker=request.ticker,
-            start_date=request.start_date,
-            end_date=request.end_date,
-            num_events=request.num_events,
-        )
-        return result
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Critical events search failed: {str(e)}")
+    job_id = create_job()
+    background_tasks.add_task(
+        run_job,
+        job_id,
+        "Critical events search failed",
+        search_critical_events,
+        ticker=request.ticker,
+        start_date=request.start_date,
+        end_date=request.end_date,
+        num_events=request.num_events,
+    )
+    return {"job_id": job_id, "status": "pending"}
+
+
+# Job status endpoint
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str):
+    """
+    Get the status of a background search job.
+    
+    - **job_id**: Id returned by /api/search or /api/critical-events
+    
+    Status is one of pending, completed or failed.
+    """
+    job = _jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    
+    return {
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "result": job["result"],
+        "error": job["error"],
+    }
 
 
 if __name__ == "__main__":
     import uvicorn
     
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # uvloop and httptools ship with uvicorn[standard]
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop="uvloop", http="httptools")
 
@@ -1,49 +1,71 @@
 """Backend services."""
 
-from .yahoo_finance import fetch_yahoo_data, TimeSeriesData
+from .yahoo_finance import fetch_yahoo_data, fetch_yahoo_batch, TimeSeriesData
 from .haver_service import (
     list_databases,
     list_series,
     fetch_haver_data,
+    fetch_haver_data_bytes,
     HaverDatabase,
     HaverSeries,
     HaverTimeSeriesData,
 )
 from .crypto_service import (
     fetch_crypto_data,
+    fetch_crypto_batch,
     list_popular_cryptos,
     CryptoTimeSeriesData,
 )
 from .forex_service import (
     fetch_forex_data,
+    fetch_forex_batch,
     list_popular_forex_pairs,
     ForexTimeSeriesData,
 )
 from .parallel_search import search_time_series_event, SearchResult
-from .backtest_service import run_backtest, BacktestResult, BacktestWindow
-from .critical_events_service import search_critical_events, CriticalEventsResult
+from .parallel_client import close_parallel_client
+from .text_formatter import close_openai_client
+from .backtest_service import (
+    run_backtest,
+    close_backtest_client,
+    BacktestResult,
+    BacktestWindow,
+)
+from .critical_events_service import (
+    search_critical_events,
+    search_critical_events_batch,
+    CriticalEventsResult,
+)
 
 __all__ = [
     "fetch_yahoo_data",
+    "fetch_yahoo_batch",
     "TimeSeriesData",
     "list_databases",
     "list_series",
     "fetch_haver_data",
+    "fetch_haver_data_bytes",
     "HaverDatabase",
     "HaverSeries",
     "HaverTimeSeriesData",
     "fetch_crypto_data",
+    "fetch_crypto_batch",
     "list_popular_cryptos",
     "CryptoTimeSeriesData",
     "fetch_forex_data",
+    "fetch_forex_batch",
     "list_popular_forex_pairs",
     "ForexTimeSeriesData",
     "search_time_series_event",
     "SearchResult",
+    "close_parallel_client",
+    "close_openai_client",
     "run_backtest",
+    "close_backtest_client",
     "BacktestResult",
     "BacktestWindow",
     "search_critical_events",
+    "search_critical_events_batch",
     "CriticalEventsResult",
 ]
 
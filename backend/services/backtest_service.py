@@ -3,13 +3,75 @@
 Note: Requires Python 3.10+ due to synthefy SDK type hints.
 """
 
+import asyncio
+import functools
+import hashlib
+import logging
 import os
-from typing import List, Tuple
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, List, Optional, Sequence, Tuple, Union
 
+import httpx
+import numpy as np
 import pandas as pd
 from pydantic import BaseModel
-from synthefy.data_models import ForecastV2Request
-from synthefy.api_client import SynthefyAsyncAPIClient
+from synthefy.data_models import ForecastV2Request, SingleSampleForecastPayload
+from synthefy.api_client import (
+    APIConnectionError,
+    APIStatusError,
+    APITimeoutError,
+    SynthefyAsyncAPIClient,
+)
+
+
+logger = logging.getLogger(__name__)
+
+MODEL_NAME = 'sfm-moe-v1'
+
+# Minimum rows (history plus the target itself) for a window to be forecast
+MIN_WINDOW_ROWS = 10
+
+# Windows per forecast call, and how many calls may be in flight at once
+DEFAULT_BATCH_SIZE = 8
+MAX_CONCURRENT_REQUESTS = 4
+
+# Request rate allowed towards the Synthefy API
+DEFAULT_RATE_PER_SECOND = 5.0
+DEFAULT_BURST = 5
+
+# Retries of transient API failures: exponential backoff with full jitter
+RETRY_STATUS_CODES = (429, 502, 503, 504)
+MAX_RETRIES = 3
+BACKOFF_BASE_SECONDS = 1.0
+MAX_BACKOFF_SECONDS = 30.0
+
+# Pause all submissions after CIRCUIT_FAILURE_THRESHOLD transient failures
+# within CIRCUIT_WINDOW_SECONDS, for CIRCUIT_COOLDOWN_SECONDS
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_WINDOW_SECONDS = 10.0
+CIRCUIT_COOLDOWN_SECONDS = 5.0
+
+# Shared Synthefy client, created on first use and kept open so its
+# connection pool survives across backtests
+_client: Optional[SynthefyAsyncAPIClient] = None
+_client_lock = asyncio.Lock()
+
+# Finished backtests are cached on disk, keyed by their inputs
+BACKTEST_CACHE_DIR = Path(".cache") / "backtest"
+BACKTEST_CACHE_TTL_SECONDS = 24 * 3600
+
+# Synthefy forecast window for each detected frequency
+_FREQ_WINDOW = {
+    'D': '1D',
+    'W': '1W',
+    'M': '1M',
+    'Q': '1Q',
+    'A': '1Y',
+}
 
 
 class BacktestWindow(BaseModel):
@@ -24,6 +86,19 @@ class BacktestWindow(BaseModel):
     timestamps: List[str]
 
 
+@dataclass(slots=True)
+class _WindowRaw:
+    """Window fields gathered while results stream in, before building BacktestWindow."""
+    
+    history_start: str
+    history_end: str
+    target_start: str
+    target_end: str
+    actual_values: List[float]
+    forecast_values: List[float]
+    timestamps: List[str]
+
+
 class BacktestResult(BaseModel):
     """Backtest result with metrics."""
     
@@ -38,6 +113,195 @@ class BacktestResult(BaseModel):
     total_points: int
 
 
+class RateLimiter:
+    """
+    Token bucket limiting how fast forecast calls are issued.
+    
+    Up to max_tokens calls may go out back to back; after that, calls are
+    admitted at rate per second as tokens refill.
+    """
+    
+    def __init__(self, rate_per_second: float = DEFAULT_RATE_PER_SECOND, burst: int = DEFAULT_BURST):
+        self.rate = rate_per_second
+        self.max_tokens = burst
+        self.tokens = burst
+        self.updated_at = time.monotonic()
+    
+    async def wait_for_token(self):
+        """Wait until a token is available, then consume it."""
+        while self.tokens < 1:
+            self._add_new_tokens()
+            await asyncio.sleep(0.1)
+        self.tokens -= 1
+    
+    def _add_new_tokens(self):
+        now = time.monotonic()
+        new_tokens = (now - self.updated_at) * self.rate
+        if self.tokens + new_tokens >= 1:
+            self.tokens = min(self.tokens + new_tokens, self.max_tokens)
+            self.updated_at = now
+
+
+class CircuitBreaker:
+    """
+    Shared pause for forecast calls when the API keeps failing.
+    
+    Every call waits on circuit_open before it is sent. Once too many
+    transient failures land within the rolling window, the circuit opens
+    (circuit_open is cleared) and no new calls go out until the cool-down
+    has passed.
+    """
+    
+    def __init__(
+        self,
+        threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        window_seconds: float = CIRCUIT_WINDOW_SECONDS,
+        cooldown_seconds: float = CIRCUIT_COOLDOWN_SECONDS,
+    ):
+        self.threshold = threshold
+        self.window_seconds = window_seconds
+        self.cooldown_seconds = cooldown_seconds
+        self.failures = deque()
+        self.circuit_open = asyncio.Event()
+        self.circuit_open.set()
+    
+    async def wait(self):
+        """Wait until calls are allowed through."""
+        await self.circuit_open.wait()
+    
+    def record_failure(self):
+        """Record a transient failure, opening the circuit if they pile up."""
+        now = time.monotonic()
+        self.failures.append(now)
+        while self.failures and now - self.failures[0] > self.window_seconds:
+            self.failures.popleft()
+        
+        if len(self.failures) >= self.threshold and self.circuit_open.is_set():
+            logger.warning("%d failures in %.0fs, pausing forecast calls for %.0fs",
+                           len(self.failures), self.window_seconds, self.cooldown_seconds)
+            self.failures.clear()
+            self.circuit_open.clear()
+            asyncio.get_running_loop().call_later(self.cooldown_seconds, self.circuit_open.set)
+
+
+def _retry_after_seconds(error: APIStatusError) -> Optional[float]:
+    """Retry-After hint from an API error body, if the API sent one."""
+    body = error.response_body
+    if not isinstance(body, dict):
+        return None
+    value = body.get("retry_after") or body.get("retry-after")
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _backoff_seconds(attempt: int) -> float:
+    """Exponential backoff with full jitter for the given retry attempt."""
+    return random.uniform(0, min(MAX_BACKOFF_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+
+class AdmissionController:
+    """
+    Concurrency limit for forecast calls that can be resized while in use.
+    
+    The limit drops by one on each 502/503/504 from the API and grows back
+    by one (up to its starting value) after SUCCESS_STREAK successful calls.
+    """
+    
+    SUCCESS_STREAK = 5
+    
+    def __init__(self, max_concurrent: int):
+        self.max_concurrency = max_concurrent
+        self.limit = max_concurrent
+        self.in_flight = 0
+        self.successes = 0
+        self.cond = asyncio.Condition(asyncio.Lock())
+    
+    async def acquire(self):
+        """Wait for a free slot and take it."""
+        async with self.cond:
+            await self.cond.wait_for(lambda: self.in_flight < self.max_concurrency)
+            self.in_flight += 1
+    
+    async def release(self):
+        """Give a slot back."""
+        async with self.cond:
+            self.in_flight -= 1
+            self.cond.notify(1)
+    
+    async def resize(self, new_max: int):
+        """Change the concurrency limit, waking waiters if it grew."""
+        async with self.cond:
+            grew = new_max > self.max_concurrency
+            self.max_concurrency = new_max
+            if grew:
+                self.cond.notify_all()
+    
+    async def record_backpressure(self):
+        """Shrink the limit after the API signalled it is overloaded."""
+        self.successes = 0
+        if self.max_concurrency > 1:
+            logger.debug("Reducing forecast concurrency to %d", self.max_concurrency - 1)
+        await self.resize(max(self.max_concurrency - 1, 1))
+    
+    async def record_success(self):
+        """Grow the limit back once calls have been succeeding for a while."""
+        self.successes += 1
+        if self.successes >= self.SUCCESS_STREAK and self.max_concurrency < self.limit:
+            self.successes = 0
+            await self.resize(self.max_concurrency + 1)
+
+
+def get_backtest_cache_key(
+    ticker: str,
+    timestamps: Union[Sequence[str], np.ndarray],
+    values: Union[Sequence[float], np.ndarray],
+    start_date: str,
+    end_date: str,
+) -> str:
+    """Hash the inputs of a backtest into a cache key."""
+    ts = np.asarray(timestamps)
+    if np.issubdtype(ts.dtype, np.datetime64):
+        ts_bytes = ts.astype('datetime64[ns]').tobytes()
+    else:
+        ts_bytes = "\x00".join(str(t) for t in timestamps).encode()
+    
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{ticker}|{start_date}|{end_date}|{MODEL_NAME}|".encode())
+    h.update(np.asarray(values, dtype=np.float64).tobytes())
+    h.update(ts_bytes)
+    return h.hexdigest()
+
+
+def load_backtest_from_cache(key: str) -> Optional[BacktestResult]:
+    """Load a cached backtest result if it exists and has not expired."""
+    cache_path = BACKTEST_CACHE_DIR / f"{key}.json"
+    try:
+        if time.time() - cache_path.stat().st_mtime > BACKTEST_CACHE_TTL_SECONDS:
+            return None
+        return BacktestResult.model_validate_json(cache_path.read_text())
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning("Failed to load backtest cache for %s: %s", key, e)
+        return None
+
+
+def save_backtest_to_cache(key: str, result: BacktestResult):
+    """Save a backtest result to the cache, replacing any previous entry atomically."""
+    cache_path = BACKTEST_CACHE_DIR / f"{key}.json"
+    tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        BACKTEST_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_text(result.model_dump_json())
+        os.replace(tmp_path, cache_path)
+    except Exception as e:
+        logger.warning("Failed to save backtest cache for %s: %s", key, e)
+        tmp_path.unlink(missing_ok=True)
+
+
+@functools.lru_cache(maxsize=1)
 def get_synthefy_api_key() -> str:
     """Get Synthefy API key from environment variable."""
     api_key = os.getenv("SYNTHEFY_API_KEY")
@@ -49,34 +313,100 @@ def get_synthefy_api_key() -> str:
     return api_key
 
 
-def detect_frequency(timestamps: List[str]) -> Tuple[str, str]:
+class _PooledSynthefyClient(SynthefyAsyncAPIClient):
+    """
+    Synthefy client with its connection pool sized for concurrent forecast calls.
+    
+    The SDK (written against synthefy 6.3.0) builds an httpx.AsyncClient as
+    `self.client` in __init__ and takes no limits or transport argument, so
+    that client is rebuilt here with the same base_url, headers and timeout.
+    """
+    
+    def __init__(self, *args, max_connections: int = MAX_CONCURRENT_REQUESTS, **kwargs):
+        super().__init__(*args, **kwargs)
+        sdk_client = getattr(self, "client", None)
+        if not isinstance(sdk_client, httpx.AsyncClient):
+            raise ValueError(
+                "Unsupported synthefy SDK: expected an httpx.AsyncClient on SynthefyAsyncAPIClient.client"
+            )
+        # Nothing has been sent through the SDK's client yet, so it holds no connections
+        self.client = httpx.AsyncClient(
+            base_url=sdk_client.base_url,
+            headers=sdk_client.headers,
+            timeout=sdk_client.timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+        )
+
+
+async def _get_client() -> SynthefyAsyncAPIClient:
+    """Get the shared Synthefy client, creating it on first use."""
+    global _client
+    async with _client_lock:
+        if _client is None:
+            # Retries are handled here, so the SDK's own retry loop is turned off
+            _client = _PooledSynthefyClient(api_key=get_synthefy_api_key(), max_retries=0)
+        return _client
+
+
+async def close_backtest_client():
+    """Close the shared Synthefy client, e.g. on application shutdown."""
+    global _client
+    async with _client_lock:
+        if _client is not None:
+            await _client.aclose()
+            _client = None
+
+
+def detect_frequency(timestamps: Union[Sequence[str], np.ndarray]) -> Tuple[str, str]:
     """
     Detect the frequency of a time series.
     
+    Args:
+        timestamps: ISO timestamp strings or numpy datetime64 values
+    
     Returns:
         Tuple of (frequency_code, human_readable_name)
         e.g., ('D', 'day'), ('Q', 'quarter'), ('M', 'month')
     """
-    print(f"DEBUG [detect_frequency]: Analyzing {len(timestamps)} timestamps")
+    logger.debug("Analyzing %d timestamps", len(timestamps))
     
     if len(timestamps) < 2:
-        print("DEBUG [detect_frequency]: Less than 2 timestamps, defaulting to daily")
+        logger.debug("Less than 2 timestamps, defaulting to daily")
         return 'D', 'day'
     
     # Parse timestamps
     try:
-        dates = pd.to_datetime(timestamps)
-        print(f"DEBUG [detect_frequency]: First date: {dates[0]}, Last date: {dates[-1]}")
+        dates = np.asarray(timestamps)
+        if np.issubdtype(dates.dtype, np.datetime64):
+            dates = dates.astype('datetime64[ns]')
+        else:
+            dates = pd.to_datetime(dates).values.astype('datetime64[ns]')
     except Exception as e:
-        print(f"DEBUG [detect_frequency]: Failed to parse timestamps: {e}, defaulting to daily")
+        logger.debug("Failed to parse timestamps: %s, defaulting to daily", e)
         return 'D', 'day'
     
-    # Calculate median difference between consecutive timestamps
-    diffs = dates.diff()[1:]
-    median_diff = diffs.median()
+    return _detect_frequency_from_parsed(dates)
+
+
+def _detect_frequency_from_parsed(dates: np.ndarray) -> Tuple[str, str]:
+    """
+    Detect the frequency of already-parsed datetime64[ns] timestamps.
+    
+    Returns:
+        Tuple of (frequency_code, human_readable_name)
+    """
+    if len(dates) < 2:
+        return 'D', 'day'
     
-    days = median_diff.days
-    print(f"DEBUG [detect_frequency]: Median difference between timestamps: {days} days")
+    logger.debug("First date: %s, Last date: %s", dates[0], dates[-1])
+    
+    # Calculate median difference between consecutive timestamps
+    diffs_ns = np.diff(dates).astype('int64')
+    days = int(np.median(diffs_ns) // 86_400_000_000_000)
+    logger.debug("Median difference between timestamps: %d days", days)
     
     # Classify based on median difference
     if days <= 1:
@@ -90,217 +420,415 @@ def detect_frequency(timestamps: List[str]) -> Tuple[str, str]:
     else:
         freq = ('A', 'year')
     
-    print(f"DEBUG [detect_frequency]: Detected frequency: {freq[0]} ({freq[1]})")
+    logger.debug("Detected frequency: %s (%s)", freq[0], freq[1])
     return freq
 
 
-def get_forecast_window_string(frequency: str) -> str:
-    """Get the forecast window string for Synthefy API based on frequency."""
-    mapping = {
-        'D': '1D',
-        'W': '1W',
-        'M': '1M',
-        'Q': '1Q',
-        'A': '1Y',
-    }
-    result = mapping.get(frequency, '1D')
-    print(f"DEBUG [get_forecast_window_string]: Frequency {frequency} -> Window {result}")
-    return result
+@dataclass(slots=True)
+class _ErrorMetrics:
+    """
+    Running sums for MAPE and MAE, folded in one batch of points at a time.
+    
+    Points with a zero actual value count towards MAE but have no defined
+    percentage error, so they are left out of MAPE.
+    """
+    
+    points: int = 0
+    abs_error_sum: float = 0.0
+    pct_error_sum: float = 0.0
+    pct_error_count: int = 0
+    
+    def add(
+        self,
+        actual: Union[Sequence[float], np.ndarray],
+        forecast: Union[Sequence[float], np.ndarray],
+    ):
+        """Fold a batch of actual and forecast values into the sums."""
+        a = np.asarray(actual, dtype=np.float64)
+        f = np.asarray(forecast, dtype=np.float64)
+        if a.shape != f.shape:
+            raise ValueError("Actual and forecast must have same length")
+        
+        nonzero = a != 0.0
+        self.points += a.size
+        self.abs_error_sum += float(np.abs(a - f).sum())
+        self.pct_error_sum += float((np.abs((a[nonzero] - f[nonzero]) / a[nonzero]) * 100.0).sum())
+        self.pct_error_count += int(nonzero.sum())
+    
+    @property
+    def mape(self) -> float:
+        """Mean Absolute Percentage Error, 0.0 if there are no non-zero actuals."""
+        return self.pct_error_sum / self.pct_error_count if self.pct_error_count else 0.0
+    
+    @property
+    def mae(self) -> float:
+        """Mean Absolute Error, 0.0 if there are no points."""
+        return self.abs_error_sum / self.points if self.points else 0.0
 
 
-def calculate_mape(actual: List[float], forecast: List[float]) -> float:
+def calculate_mape(
+    actual: Union[Sequence[float], np.ndarray],
+    forecast: Union[Sequence[float], np.ndarray],
+) -> float:
     """Calculate Mean Absolute Percentage Error."""
-    if len(actual) != len(forecast):
-        raise ValueError("Actual and forecast must have same length")
+    metrics = _ErrorMetrics()
+    metrics.add(actual, forecast)
+    logger.debug("MAPE = %.2f%% from %d non-zero points", metrics.mape, metrics.pct_error_count)
+    return metrics.mape
+
+
+def calculate_mae(
+    actual: Union[Sequence[float], np.ndarray],
+    forecast: Union[Sequence[float], np.ndarray],
+) -> float:
+    """Calculate Mean Absolute Error."""
+    metrics = _ErrorMetrics()
+    metrics.add(actual, forecast)
+    logger.debug("MAE = %.4f from %d points", metrics.mae, metrics.points)
+    return metrics.mae
+
+
+def _flatten_and_cast(seq: Sequence) -> np.ndarray:
+    """
+    Cast forecast values to a float64 array.
+    
+    Values may be scalars or 1-wide lists ([v] -> v); None becomes NaN.
+    """
+    arr = np.asarray(seq, dtype=object)
+    if arr.ndim == 2:
+        arr = arr[:, 0]
+    elif any(isinstance(v, list) for v in arr):
+        # Ragged mix of scalars and lists
+        arr = np.array([(v[0] if v else None) if isinstance(v, list) else v for v in arr], dtype=object)
+    return arr.astype(np.float64)
+
+
+def _is_payload_error(error: Exception) -> bool:
+    """Whether the API rejected the request itself (4xx other than auth or rate limits)."""
+    return (
+        isinstance(error, APIStatusError)
+        and 400 <= error.status_code < 500
+        and error.status_code not in (401, 403, 429)
+    )
+
+
+async def _forecast_request(
+    client: SynthefyAsyncAPIClient,
+    request: ForecastV2Request,
+    limiter: RateLimiter,
+    controller: AdmissionController,
+    breaker: CircuitBreaker,
+) -> List[List[SingleSampleForecastPayload]]:
+    """
+    Forecast every sample of a request in a single API call.
     
-    if len(actual) == 0:
-        return 0.0
+    Rate limits (429), gateway errors (502-504), timeouts and connection
+    errors are retried up to MAX_RETRIES times with exponential backoff.
+    If they persist, the whole batch comes back with no forecasts, so its
+    windows are skipped. If the API rejects the payload (any other 4xx), the
+    samples are split in half and each half is retried, down to single
+    samples; a single sample that is still rejected is skipped. Any other
+    failure skips the batch. Authentication errors (401/403) are raised,
+    since every window would fail the same way.
+    """
+    for attempt in range(MAX_RETRIES + 1):
+        await breaker.wait()
+        await limiter.wait_for_token()
+        try:
+            response = await client.forecast(request)
+            await controller.record_success()
+            return response.forecasts
+        except APIStatusError as e:
+            if e.status_code in (401, 403):
+                raise
+            if e.status_code in (502, 503, 504):
+                await controller.record_backpressure()
+            
+            if e.status_code in RETRY_STATUS_CODES and attempt < MAX_RETRIES:
+                breaker.record_failure()
+                wait = _backoff_seconds(attempt)
+                retry_after = _retry_after_seconds(e)
+                if retry_after is not None:
+                    wait = max(wait, retry_after)
+                logger.info("HTTP %d, retrying in %.1fs (attempt %d/%d)",
+                            e.status_code, wait, attempt + 1, MAX_RETRIES)
+                await asyncio.sleep(wait)
+                continue
+            error = e
+        except (APITimeoutError, APIConnectionError) as e:
+            if attempt < MAX_RETRIES:
+                breaker.record_failure()
+                wait = _backoff_seconds(attempt)
+                logger.info("%s, retrying in %.1fs (attempt %d/%d)",
+                            type(e).__name__, wait, attempt + 1, MAX_RETRIES)
+                await asyncio.sleep(wait)
+                continue
+            error = e
+        except Exception as e:
+            error = e
+        break
     
-    errors = []
-    for a, f in zip(actual, forecast):
-        if a != 0:
-            errors.append(abs((a - f) / a) * 100)
+    # Only a rejected payload can be narrowed down by splitting the batch;
+    # anything else would just fail again for each half
+    if not _is_payload_error(error) or len(request.samples) == 1:
+        logger.warning("Forecast failed for %d window(s), skipping them: %s",
+                       len(request.samples), error)
+        return [[] for _ in request.samples]
     
-    mape = sum(errors) / len(errors) if errors else 0.0
-    print(f"DEBUG [calculate_mape]: MAPE = {mape:.2f}% from {len(errors)} non-zero points")
-    return mape
+    mid = len(request.samples) // 2
+    logger.info("HTTP %d for %d samples, retrying as two batches",
+                error.status_code, len(request.samples))
+    head = await _forecast_request(
+        client,
+        ForecastV2Request(samples=request.samples[:mid], model=request.model),
+        limiter,
+        controller,
+        breaker,
+    )
+    tail = await _forecast_request(
+        client,
+        ForecastV2Request(samples=request.samples[mid:], model=request.model),
+        limiter,
+        controller,
+        breaker,
+    )
+    return head + tail
 
 
-def calculate_mae(actual: List[float], forecast: List[float]) -> float:
-    """Calculate Mean Absolute Error."""
-    if len(actual) != len(forecast):
-        raise ValueError("Actual and forecast must have same length")
+async def _forecast_batches(
+    client: SynthefyAsyncAPIClient,
+    request: ForecastV2Request,
+    batch_size: int,
+    max_concurrent: int,
+    limiter: RateLimiter,
+) -> AsyncIterator[Tuple[int, List[List[SingleSampleForecastPayload]]]]:
+    """
+    Forecast a request's samples in micro-batches submitted concurrently.
     
-    if len(actual) == 0:
-        return 0.0
+    Args:
+        client: Open Synthefy client
+        request: Request holding every backtest window
+        batch_size: Samples per API call
+        max_concurrent: Starting limit on API calls in flight at once
+        limiter: Rate limiter shared by every call of this backtest
+        
+    Yields:
+        (offset, forecasts) for each batch as it completes, where offset is
+        the index in request.samples of the batch's first sample
+    """
+    controller = AdmissionController(max_concurrent)
+    breaker = CircuitBreaker()
+    
+    async def forecast_batch(offset):
+        batch = request.samples[offset:offset + batch_size]
+        await controller.acquire()
+        try:
+            forecasts = await _forecast_request(
+                client,
+                ForecastV2Request(samples=batch, model=request.model),
+                limiter,
+                controller,
+                breaker,
+            )
+            return offset, forecasts
+        finally:
+            await controller.release()
     
-    errors = [abs(a - f) for a, f in zip(actual, forecast)]
-    mae = sum(errors) / len(errors)
-    print(f"DEBUG [calculate_mae]: MAE = {mae:.4f} from {len(errors)} points")
-    return mae
+    offsets = range(0, len(request.samples), batch_size)
+    logger.debug("%d windows in %d batches of up to %d",
+                 len(request.samples), len(offsets), batch_size)
+    pending = [asyncio.create_task(forecast_batch(offset)) for offset in offsets]
+    try:
+        for next_done in asyncio.as_completed(pending):
+            yield await next_done
+    finally:
+        for task in pending:
+            task.cancel()
 
 
 async def run_backtest(
     ticker: str,
-    timestamps: List[str],
-    values: List[float],
+    timestamps: Union[Sequence[str], np.ndarray],
+    values: Union[Sequence[float], np.ndarray],
     start_date: str,
     end_date: str,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_concurrent: int = MAX_CONCURRENT_REQUESTS,
+    rate_per_second: float = DEFAULT_RATE_PER_SECOND,
+    burst: int = DEFAULT_BURST,
+    show_progress: bool = True,
 ) -> BacktestResult:
     """
     Run a backtest on a time series using Synthefy.
     
+    Every data point in the selected region becomes a one-step forecast
+    target, with all earlier data as history. Windows are sent to the API
+    in micro-batches of batch_size, with up to max_concurrent calls in flight.
+    
     Args:
         ticker: The ticker/series identifier
-        timestamps: All timestamps in the time series
+        timestamps: All timestamps in the time series (ISO strings or datetime64)
         values: All values in the time series
         start_date: Start of the selected region (cutoff date)
         end_date: End of the selected region
+        batch_size: Windows per forecast call
+        max_concurrent: Maximum concurrent forecast calls
+        rate_per_second: Sustained forecast calls per second
+        burst: Forecast calls allowed back to back before rate limiting
+        show_progress: Log progress and a summary at INFO level
         
     Returns:
         BacktestResult with forecast windows and metrics
     """
-    print("=" * 60)
-    print("DEBUG [run_backtest]: Starting backtest")
-    print(f"DEBUG [run_backtest]: Ticker: {ticker}")
-    print(f"DEBUG [run_backtest]: Total data points: {len(timestamps)}")
-    print(f"DEBUG [run_backtest]: Selected region: {start_date} to {end_date}")
-    print("=" * 60)
+    logger.debug("Starting backtest for %s: %d data points, region %s to %s",
+                 ticker, len(timestamps), start_date, end_date)
+    
+    cache_key = get_backtest_cache_key(ticker, timestamps, values, start_date, end_date)
+    cached = load_backtest_from_cache(cache_key)
+    if cached is not None:
+        logger.debug("Cache HIT for %s (%s)", ticker, cache_key)
+        return cached
     
     # Get API key
     api_key = get_synthefy_api_key()
-    print(f"DEBUG [run_backtest]: API key loaded (length: {len(api_key)})")
+    logger.debug("API key loaded (length: %d)", len(api_key))
+    
+    # Parse timestamps once, then keep the series as sorted parallel arrays
+    dates_ns = pd.to_datetime(timestamps).values.astype('datetime64[ns]')
+    vals = np.asarray(values, dtype=np.float64)
+    order = np.argsort(dates_ns, kind='stable')
+    dates_ns = dates_ns[order]
+    vals = vals[order]
     
     # Detect frequency
-    freq_code, freq_name = detect_frequency(timestamps)
-    forecast_window = get_forecast_window_string(freq_code)
+    freq_code, freq_name = _detect_frequency_from_parsed(dates_ns)
+    forecast_window = _FREQ_WINDOW.get(freq_code, '1D')
     stride = forecast_window  # Same as forecast window
     
-    print(f"DEBUG [run_backtest]: Forecast window: {forecast_window}")
-    print(f"DEBUG [run_backtest]: Stride: {stride}")
-    
-    # Create DataFrame from all data
-    df = pd.DataFrame({
-        'date': pd.to_datetime(timestamps),
-        'value': values,
-    })
-    df = df.sort_values('date').reset_index(drop=True)
+    logger.debug("Forecast window: %s, Stride: %s", forecast_window, stride)
     
-    print(f"DEBUG [run_backtest]: DataFrame created with {len(df)} rows")
-    print(f"DEBUG [run_backtest]: Date range: {df['date'].min()} to {df['date'].max()}")
-    print(f"DEBUG [run_backtest]: Value range: {df['value'].min():.2f} to {df['value'].max():.2f}")
+    if logger.isEnabledFor(logging.DEBUG) and len(vals) > 0:
+        logger.debug("Series has %d rows", len(vals))
+        logger.debug("Date range: %s to %s", dates_ns[0], dates_ns[-1])
+        logger.debug("Value range: %.2f to %.2f", np.nanmin(vals), np.nanmax(vals))
     
     try:
-        # Get dates in the target region
+        # Get rows in the target region
         start_dt = pd.to_datetime(start_date)
         end_dt = pd.to_datetime(end_date)
         
-        target_mask = (df['date'] >= start_dt) & (df['date'] <= end_dt)
-        target_dates = df.loc[target_mask, 'date'].tolist()
+        # dates_ns is sorted, so the region's bounds are two binary searches
+        lo = int(np.searchsorted(dates_ns, np.datetime64(start_dt, 'ns'), side='left'))
+        hi = int(np.searchsorted(dates_ns, np.datetime64(end_dt, 'ns'), side='right'))
         
-        print(f"DEBUG [run_backtest]: Found {len(target_dates)} data points in target region")
+        logger.debug("Found %d data points in target region", hi - lo)
         
-        if len(target_dates) == 0:
+        if hi <= lo:
             raise ValueError("No data points in selected region")
         
-        # Process windows in batches to avoid overwhelming the API
-        # We'll make individual requests for each window
-        result_windows: List[BacktestWindow] = []
-        all_actuals: List[float] = []
-        all_forecasts: List[float] = []
+        # Targets without enough history are skipped
+        first_target_idx = max(lo, MIN_WINDOW_ROWS - 1)
+        last_target_idx = hi - 1
+        if first_target_idx > last_target_idx:
+            raise ValueError("Insufficient history before selected region")
         
-        print(f"DEBUG [run_backtest]: Processing {len(target_dates)} rolling windows...")
+        if first_target_idx > lo:
+            logger.debug("Skipping %d windows with insufficient history", first_target_idx - lo)
         
-        async with SynthefyAsyncAPIClient(api_key=api_key) as client:
-            for i, target_date in enumerate(target_dates):
-                # Create a DataFrame for this window
-                # History: all data up to (but not including) target_date
-                # We include target_date in the df so from_dfs_pre_split can create the target
-                window_df = df[df['date'] <= target_date].copy()
-                
-                if len(window_df) < 10:
-                    print(f"DEBUG [run_backtest]: Window {i+1} - Insufficient history, skipping")
-                    continue
-                
-                # Get actual value for this target date
-                actual_value = float(df.loc[df['date'] == target_date, 'value'].values[0])
-                
-                # Use cutoff_date as the day BEFORE target_date
-                # This way target_date becomes the forecast target
-                history_df = df[df['date'] < target_date].copy()
-                if len(history_df) == 0:
-                    continue
-                    
-                cutoff_str = history_df['date'].max().strftime('%Y-%m-%d')
-                
-                try:
-                    # Create request for this single window
-                    request = ForecastV2Request.from_dfs_pre_split(
-                        dfs=[window_df],
-                        timestamp_col='date',
-                        target_cols=['value'],
-                        model='sfm-moe-v1',
-                        cutoff_date=cutoff_str,
-                        forecast_window=forecast_window,
-                        stride=stride,
-                    )
-                    
-                    if len(request.samples) == 0:
-                        continue
-                    
-                    # Make API call
-                    response = await client.forecast(request)
-                    
-                    if len(response.forecasts) > 0 and len(response.forecasts[0]) > 0:
-                        forecast = response.forecasts[0][0]
-                        
-                        # Get forecast value
-                        forecast_value = None
-                        if forecast.values:
-                            if isinstance(forecast.values[0], list):
-                                forecast_value = float(forecast.values[0][0])
-                            else:
-                                forecast_value = float(forecast.values[0])
-                        
-                        if forecast_value is not None:
-                            all_actuals.append(actual_value)
-                            all_forecasts.append(forecast_value)
-                            
-                            # Get history info from the sample
-                            sample = request.samples[0][0]
-                            
-                            result_windows.append(BacktestWindow(
-                                history_start=str(sample.history_timestamps[0]),
-                                history_end=str(sample.history_timestamps[-1]),
-                                target_start=target_date.strftime('%Y-%m-%dT%H:%M:%S'),
-                                target_end=target_date.strftime('%Y-%m-%dT%H:%M:%S'),
-                                actual_values=[actual_value],
-                                forecast_values=[forecast_value],
-                                timestamps=[target_date.strftime('%Y-%m-%dT%H:%M:%S')],
-                            ))
-                            
-                            # Log progress
-                            if (i + 1) % 10 == 0 or i < 3 or i == len(target_dates) - 1:
-                                print(f"DEBUG [run_backtest]: Window {i+1}/{len(target_dates)} - "
-                                      f"Target: {target_date.date()}, Actual: {actual_value:.2f}, "
-                                      f"Forecast: {forecast_value:.2f}")
+        # One window per target row: each row's history is every row before it.
+        # The SDK needs a DataFrame; wrap views of the arrays without copying.
+        backtest_df = pd.DataFrame({
+            'date': dates_ns[:last_target_idx + 1],
+            'value': vals[:last_target_idx + 1],
+        }, copy=False)
+        num_target_rows = last_target_idx - first_target_idx + 1
+        
+        # Building the samples is CPU-bound, so keep it off the event loop
+        # while the shared client is fetched (or created) alongside it
+        request, client = await asyncio.gather(
+            asyncio.to_thread(
+                ForecastV2Request.from_dfs_pre_split,
+                dfs=[backtest_df],
+                timestamp_col='date',
+                target_cols=['value'],
+                model=MODEL_NAME,
+                num_target_rows=num_target_rows,
+                forecast_window=1,
+                stride=1,
+            ),
+            _get_client(),
+        )
+        
+        logger.debug("Submitting %d windows...", len(request.samples))
+        
+        limiter = RateLimiter(rate_per_second, burst)
+        num_windows = len(request.samples)
+        windows_by_target: List[Optional[_WindowRaw]] = [None] * num_windows
+        
+        # Running sums for the metrics, folded in as each batch completes
+        metrics = _ErrorMetrics()
+        completed = 0
+        
+        batches = _forecast_batches(client, request, batch_size, max_concurrent, limiter)
+        async for offset, forecasts in batches:
+            # One-step forecasts for the whole batch, NaN where none came back
+            forecast_arr = _flatten_and_cast([
+                row[0].values[0] if row and row[0].values else None
+                for row in forecasts
+            ])
+            lo_idx = first_target_idx + offset
+            hi_idx = lo_idx + len(forecast_arr)
+            actual_arr = vals[lo_idx:hi_idx]
+            valid = ~np.isnan(forecast_arr)
+            
+            metrics.add(actual_arr[valid], forecast_arr[valid])
+            
+            target_strs = np.datetime_as_string(dates_ns[lo_idx:hi_idx], unit='s').tolist()
+            actual_list = actual_arr.tolist()
+            forecast_list = forecast_arr.tolist()
+            for j in np.flatnonzero(valid).tolist():
+                i = offset + j
+                sample = request.samples[i][0]
+                target_str = target_strs[j]
                 
-                except Exception as e:
-                    print(f"DEBUG [run_backtest]: Window {i+1} error: {e}")
-                    continue
+                windows_by_target[i] = _WindowRaw(
+                    history_start=str(sample.history_timestamps[0]),
+                    history_end=str(sample.history_timestamps[-1]),
+                    target_start=target_str,
+                    target_end=target_str,
+                    actual_values=[actual_list[j]],
+                    forecast_values=[forecast_list[j]],
+                    timestamps=[target_str],
+                )
+            
+            # Log progress once per completed batch
+            completed += len(forecasts)
+            if show_progress:
+                logger.info("Completed %d/%d windows", completed, num_windows)
         
-        print("\n" + "=" * 60)
-        print(f"DEBUG [run_backtest]: Total windows processed: {len(result_windows)}")
-        print(f"DEBUG [run_backtest]: Total data points for metrics: {len(all_actuals)}")
+        # Every field is already a str or a list of floats, so skip validation
+        result_windows = [
+            BacktestWindow.model_construct(
+                history_start=w.history_start,
+                history_end=w.history_end,
+                target_start=w.target_start,
+                target_end=w.target_end,
+                actual_values=w.actual_values,
+                forecast_values=w.forecast_values,
+                timestamps=w.timestamps,
+            )
+            for w in windows_by_target
+            if w is not None
+        ]
         
-        # Calculate overall metrics
-        if len(all_actuals) > 0:
-            mape = calculate_mape(all_actuals, all_forecasts)
-            mae = calculate_mae(all_actuals, all_forecasts)
-        else:
-            print("DEBUG [run_backtest]: No data points, setting metrics to 0")
-            mape = 0.0
-            mae = 0.0
+        logger.debug("Total windows processed: %d, data points for metrics: %d",
+                     len(result_windows), metrics.points)
+        
+        # Overall metrics from the running sums
+        if metrics.points == 0:
+            logger.debug("No data points, setting metrics to 0")
+        mape = metrics.mape
+        mae = metrics.mae
         
         result = BacktestResult(
             ticker=ticker,
@@ -311,21 +839,22 @@ async def run_backtest(
             windows=result_windows,
             mape=mape,
             mae=mae,
-            total_points=len(all_actuals),
+            total_points=metrics.points,
         )
         
-        print("=" * 60)
-        print("DEBUG [run_backtest]: Backtest completed successfully!")
-        print(f"DEBUG [run_backtest]: Final MAPE: {mape:.2f}%")
-        print(f"DEBUG [run_backtest]: Final MAE: {mae:.4f}")
-        print("=" * 60)
+        # Windows dropped after a failed forecast would be cached otherwise,
+        # hiding them even once the API recovers
+        if result_windows and len(result_windows) == num_windows:
+            save_backtest_to_cache(cache_key, result)
+        else:
+            logger.info("Not caching backtest for %s: %d of %d windows have a forecast",
+                        ticker, len(result_windows), num_windows)
+        
+        if show_progress:
+            logger.info("Backtest for %s completed: MAPE %.2f%%, MAE %.4f", ticker, mape, mae)
         
         return result
         
     except Exception as e:
-        print("=" * 60)
-        print(f"DEBUG [run_backtest]: ERROR - {type(e).__name__}: {e}")
-        print("=" * 60)
-        import traceback
-        traceback.print_exc()
+        logger.exception("Backtest for %s failed", ticker)
         raise ValueError(f"Backtest failed: {str(e)}")
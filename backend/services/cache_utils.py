@@ -0,0 +1,87 @@
+"""File-based cache shared by the data services."""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import pickle
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# File-based cache setup
+CACHE_DIR = Path(".cache")
+CACHE_DIR.mkdir(exist_ok=True)
+
+# Yahoo Finance responses are cached on disk for this long (seconds)
+YF_CACHE_TTL_SECONDS = 3600
+
+# Strong references to in-flight background writes so they aren't collected
+_pending_writes: set[asyncio.Task] = set()
+
+def get_cache_path(key: str, suffix: str = ".pkl") -> Path:
+    """Generate a safe file path for a cache key."""
+    # Use a BLAKE2b hash of the key to generate a safe filename
+    safe_key = hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+    return CACHE_DIR / f"{safe_key}{suffix}"
+
+def load_from_cache(key: str, max_age: Optional[float] = None) -> Optional[Any]:
+    """
+    Load data from cache if it exists.
+    
+    Args:
+        key: Cache key
+        max_age: If given, entries older than this many seconds are ignored
+        
+    Returns:
+        The cached data, or None on a miss
+    """
+    cache_path = get_cache_path(key)
+    if cache_path.exists():
+        if max_age is not None and time.time() - cache_path.stat().st_mtime > max_age:
+            return None
+        try:
+            with open(cache_path, "rb") as f:
+                return pickle.load(f)
+        except Exception as e:
+            logger.debug("Failed to load cache for %s: %s", key, e)
+            return None
+    
+    # Entries written before the binary format are read once and migrated
+    # (JSON files named by the MD5 hash of the key)
+    legacy_path = CACHE_DIR / f"{hashlib.md5(key.encode()).hexdigest()}.json"
+    if legacy_path.exists():
+        try:
+            with open(legacy_path, "r") as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.debug("Failed to load legacy cache for %s: %s", key, e)
+            return None
+        save_to_cache(key, data)
+        legacy_path.unlink(missing_ok=True)
+        return data
+    return None
+
+def save_to_cache(key: str, data: Any):
+    """Save data to cache, replacing any previous entry atomically."""
+    cache_path = get_cache_path(key)
+    # Writes run on worker threads, so the temp name is unique per thread too
+    tmp_path = cache_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except Exception as e:
+        logger.debug("Failed to save cache for %s: %s", key, e)
+        tmp_path.unlink(missing_ok=True)
+
+def save_to_cache_background(key: str, data: Any) -> asyncio.Task:
+    """Save data to cache in a worker thread without waiting for the write."""
+    task = asyncio.create_task(asyncio.to_thread(save_to_cache, key, data))
+    _pending_writes.add(task)
+    task.add_done_callback(_pending_writes.discard)
+    return task
@@ -1,12 +1,44 @@
 """Service for finding critical events in a time series."""
 
-import os
+import json
 import re
 from typing import Optional
 from datetime import datetime
 
 from pydantic import BaseModel
 
+from .parallel_client import get_parallel_client
+
+try:
+    import orjson as _json
+except ImportError:
+    _json = json
+
+
+# Patterns for the fallback parser, compiled once at import
+_JSON_BLOCK_RE = re.compile(r'\{[\s\S]*"events"[\s\S]*\}')
+_JSON_RESULTS_RE = re.compile(r'\{[\s\S]*"results"[\s\S]*\}')
+_EVENT_BLOCK_RE = re.compile(r'(?:^|\n)(?:\#{1,4}\s*)?(?:\*{1,2})?(\d+)[.\)]\s*')
+_ISO_DATE_RE = re.compile(r'(\d{4}-\d{2}-\d{2})')
+_MONTH_DATE_RE = re.compile(
+    r'(?P<mon>Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+(?P<day>\d{1,2}),?\s+(?P<year>\d{4})',
+    re.IGNORECASE,
+)
+_BOLD_RE = re.compile(r'\*{1,2}([^*]+)\*{1,2}')
+_TITLE_PREFIX_RE = re.compile(r'^(Date|Title|Event|Summary):\s*', re.IGNORECASE)
+_SUMMARY_RE = re.compile(r'[Ss]ummary[:\s]+(.+?)(?:\n\n|$)', re.DOTALL)
+_LINK_RE = re.compile(r'\[([^\]]+)\]\([^\)]+\)')
+
+# Text output is truncated to this many characters before regex parsing;
+# events past this point are rare and long haystacks make the patterns slow
+MAX_CONTENT_CHARS = 100_000
+
+MONTH_NUMBERS = {
+    'jan': '01', 'feb': '02', 'mar': '03', 'apr': '04',
+    'may': '05', 'jun': '06', 'jul': '07', 'aug': '08',
+    'sep': '09', 'oct': '10', 'nov': '11', 'dec': '12'
+}
+
 
 class CriticalEvent(BaseModel):
     """A critical event with timestamp and summary."""
@@ -28,43 +60,257 @@ class CriticalEventsResult(BaseModel):
     run_id: str
 
 
-async def search_critical_events(
-    ticker: str,
+def _field(data, name: str, default=None):
+    """Read a field from either a parsed JSON dict or an SDK output object."""
+    if isinstance(data, dict):
+        return data.get(name, default)
+    return getattr(data, name, default)
+
+
+def _parse_structured_events(events_data) -> list[CriticalEvent]:
+    """Build events from structured output (SDK objects or JSON dicts)."""
+    events = []
+    for event_data in events_data:
+        date_str = _field(event_data, "date")
+        if not date_str:
+            continue
+            
+        # Ensure date is in YYYY-MM-DD format
+        try:
+            # Parse and reformat to ensure consistency
+            parsed_date = datetime.strptime(date_str, "%Y-%m-%d")
+            date_str = parsed_date.strftime("%Y-%m-%d")
+            timestamp = f"{date_str}T00:00:00Z"
+        except ValueError:
+            # Try other date formats
+            try:
+                parsed_date = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
+                date_str = parsed_date.strftime("%Y-%m-%d")
+                timestamp = f"{date_str}T00:00:00Z"
+            except:
+                timestamp = f"{date_str}T00:00:00Z"
+        
+        title = _field(event_data, "title")
+        summary = _field(event_data, "summary", "") or _field(event_data, "description", "")
+        
+        # Get citations if available
+        citations = []
+        for cit in _field(event_data, "citations") or []:
+            citations.append({
+                "url": _field(cit, "url", ""),
+                "title": _field(cit, "title"),
+            })
+        
+        events.append(CriticalEvent(
+            timestamp=timestamp,
+            date=date_str,
+            summary=summary,
+            title=title,
+            citations=citations,
+        ))
+    return events
+
+
+def _parse_text_events(content: str) -> list[CriticalEvent]:
+    """Extract events from markdown/text output with numbered event blocks."""
+    events = []
+    
+    # Look for patterns like "1.", "**1.", "#### **1." or numbered events;
+    # each block runs from the end of one marker to the start of the next
+    matches = list(_EVENT_BLOCK_RE.finditer(content))
+    
+    for i, match in enumerate(matches):
+        block_end = matches[i + 1].start() if i + 1 < len(matches) else len(content)
+        block = content[match.end():block_end]
+        
+        # Extract date from block
+        date_match = _ISO_DATE_RE.search(block)
+        if not date_match:
+            # Try other date formats like "November 20, 2023"
+            month_date_match = _MONTH_DATE_RE.search(block)
+            if month_date_match:
+                month = MONTH_NUMBERS[month_date_match['mon'].lower()]
+                day = month_date_match['day'].zfill(2)
+                year = month_date_match['year']
+                date_str = f"{year}-{month}-{day}"
+            else:
+                continue
+        else:
+            date_str = date_match.group(1)
+        
+        # Extract title - usually the first line or bold text
+        title_match = _BOLD_RE.search(block[:200])
+        title = title_match.group(1).strip() if title_match else None
+        
+        # Clean up title - remove "Date:", "Title:", etc.
+        if title:
+            title = _TITLE_PREFIX_RE.sub('', title)
+        
+        # Extract summary - look for text after "Summary:" or just take the main content
+        summary_match = _SUMMARY_RE.search(block)
+        if summary_match:
+            summary = summary_match.group(1).strip()
+        else:
+            # Take first substantial paragraph
+            paragraphs = [p.strip() for p in block.split('\n\n') if p.strip()]
+            summary = paragraphs[0] if paragraphs else block[:300]
+        
+        # Clean up summary - remove markdown formatting
+        summary = _BOLD_RE.sub(r'\1', summary)
+        summary = _LINK_RE.sub(r'\1', summary)  # Remove links
+        summary = summary.strip()[:500]  # Limit length
+        
+        if date_str and summary:
+            events.append(CriticalEvent(
+                timestamp=f"{date_str}T00:00:00Z",
+                date=date_str,
+                summary=summary,
+                title=title,
+                citations=[],
+            ))
+    return events
+
+
+def _parse_json_content(content: str, key: str) -> Optional[list]:
+    """Find a JSON object in text output and return its list under key, if any."""
+    pattern = _JSON_BLOCK_RE if key == "events" else _JSON_RESULTS_RE
+    try:
+        json_match = pattern.search(content)
+        if json_match:
+            json_data = _json.loads(json_match.group())
+            if isinstance(json_data.get(key), list):
+                return json_data[key]
+    except (json.JSONDecodeError, AttributeError):
+        pass
+    return None
+
+
+def _parse_events(output) -> list[CriticalEvent]:
+    """Parse a single-ticker output, falling back to JSON or text content."""
+    # Try to parse structured output
+    events_data = _field(output, "events")
+    if events_data:
+        events = _parse_structured_events(events_data)
+        if events:
+            return events
+    
+    # If structured parsing failed, try to extract from content
+    content = _field(output, "content")
+    if content is None:
+        return []
+    if isinstance(content, dict):
+        return _parse_structured_events(content.get("events") or [])
+    
+    return _parse_events_from_content(str(content))
+
+
+def _parse_events_from_content(content: str) -> list[CriticalEvent]:
+    """Parse events from text output: an embedded JSON block, else markdown."""
+    content = content[:MAX_CONTENT_CHARS]
+    
+    events_data = _parse_json_content(content, "events")
+    if events_data is not None:
+        return _parse_structured_events(events_data)
+    
+    # If JSON parsing failed, try to extract from markdown/text
+    return _parse_text_events(content)
+
+
+def _parse_batch_results(output, tickers: list[str]) -> dict[str, list[CriticalEvent]]:
+    """Map each ticker to its events from a multi-ticker output."""
+    results = _field(output, "results")
+    if not results:
+        content = _field(output, "content")
+        if isinstance(content, dict):
+            results = content.get("results")
+        elif content is not None:
+            results = _parse_json_content(str(content)[:MAX_CONTENT_CHARS], "results")
+    
+    events_by_ticker: dict[str, list[CriticalEvent]] = {}
+    keys = [ticker.strip().upper() for ticker in tickers]
+    for result in results or []:
+        events = _parse_structured_events(_field(result, "events") or [])
+        if len(keys) == 1:
+            # The model may relabel a lone ticker (BTC -> BTC-USD), so ignore the label
+            key = keys[0]
+        else:
+            key = _match_ticker(_field(result, "ticker"), keys)
+            if key is None:
+                continue
+        events_by_ticker.setdefault(key, []).extend(events)
+    
+    # A lone ticker may still come back in the single-ticker shape
+    if not events_by_ticker and len(keys) == 1:
+        events_by_ticker[keys[0]] = _parse_events(output)
+    
+    return events_by_ticker
+
+
+def _match_ticker(label, keys: list[str]) -> Optional[str]:
+    """
+    Find which requested ticker a result label refers to.
+    
+    Labels are compared stripped and upper-cased; an exact match wins, else the
+    longest ticker contained in the label (or containing it), so "Apple Inc.
+    (AAPL)" maps to AAPL and "BTC-USD" to BTC.
+    
+    Args:
+        label: Ticker label the model wrote on a result
+        keys: Requested tickers, stripped and upper-cased
+    
+    Returns:
+        The matching key, or None if the label matches none of them
+    """
+    if not label:
+        return None
+    label = str(label).strip().upper()
+    if label in keys:
+        return label
+    
+    matches = [key for key in keys if key and (key in label or label in key)]
+    return max(matches, key=len) if matches else None
+
+
+async def search_critical_events_batch(
+    tickers: list[str],
     start_date: str,
     end_date: str,
     num_events: int = 10,
-) -> CriticalEventsResult:
+) -> list[CriticalEventsResult]:
     """
-    Search for critical events in a time series using Parallel API.
+    Search for critical events for several series in one Parallel task run.
+    
+    All tickers share a single request, which saves a round trip (and a
+    slot against the API's request-per-minute limit) per extra ticker.
     
     Args:
-        ticker: Stock ticker or series name
+        tickers: Stock tickers or series names
         start_date: Start date of the period (YYYY-MM-DD)
         end_date: End date of the period (YYYY-MM-DD)
-        num_events: Number of critical events to find (default: 10)
+        num_events: Number of critical events to find per ticker (default: 10)
         
     Returns:
-        CriticalEventsResult with list of events
+        One CriticalEventsResult per ticker, in the order given
     """
-    from parallel import Parallel
     from parallel.types import TaskSpecParam
     
-    api_key = os.getenv("PARALLEL_API_KEY")
-    if not api_key:
-        raise ValueError("PARALLEL_API_KEY environment variable not set")
+    if not tickers:
+        return []
     
-    client = Parallel(api_key=api_key)
+    client = get_parallel_client()
     
-    # Construct search query for critical events
+    # Construct search query for critical events, one section per ticker
+    ticker_sections = "\n".join(f"- {ticker}" for ticker in tickers)
     search_input = f"""
-Find the top {num_events} most important and critical events, news, or developments related to {ticker} between {start_date} and {end_date}.
+For each of the following assets or series, find the top {num_events} most important and critical events, news, or developments related to it between {start_date} and {end_date}:
+{ticker_sections}
 
 Focus on:
 - Major price movements or volatility spikes
 - Significant news announcements
 - Earnings reports or financial updates
 - Regulatory changes or policy decisions
-- Market events that significantly impacted {ticker}
+- Market events that significantly impacted the asset
 - Product launches or major business developments
 
 For each event, provide:
@@ -72,11 +318,15 @@ For each event, provide:
 2. A concise title/summary (1-2 sentences)
 3. A brief explanation of why it was critical
 
-Return the events in chronological order from earliest to latest.
+Return each asset's events in chronological order from earliest to latest.
 """
     
     # Create task run with structured output schema
-    output_schema = """Return a JSON object with a single key "events" containing an array of event objects.
+    output_schema = """Return a JSON object with a single key "results" containing one object per asset.
+
+Each result object must have these exact fields:
+- "ticker": string, the asset exactly as given in the request
+- "events": array of event objects
 
 Each event object must have these exact fields:
 - "date": string in YYYY-MM-DD format (e.g., "2024-03-15")
@@ -85,16 +335,21 @@ Each event object must have these exact fields:
 
 Return EXACTLY this JSON structure, no additional text:
 {
-  "events": [
+  "results": [
     {
-      "date": "YYYY-MM-DD",
-      "title": "Brief event title",
-      "summary": "1-2 sentence explanation."
+      "ticker": "TICKER",
+      "events": [
+        {
+          "date": "YYYY-MM-DD",
+          "title": "Brief event title",
+          "summary": "1-2 sentence explanation."
+        }
+      ]
     }
   ]
 }"""
     
-    task_run = client.task_run.create(
+    task_run = await client.task_run.create(
         input=search_input,
         task_spec=TaskSpecParam(
             output_schema=output_schema
@@ -103,160 +358,53 @@ Return EXACTLY this JSON structure, no additional text:
     )
     
     # Wait for result (with timeout)
-    run_result = client.task_run.result(task_run.run_id, api_timeout=120)
+    run_result = await client.task_run.result(task_run.run_id, api_timeout=120)
     
-    # Parse output
-    output = run_result.output
-    
-    events = []
+    events_by_ticker = _parse_batch_results(run_result.output, tickers)
     
-    # Try to parse structured output
-    if hasattr(output, "events") and output.events:
-        for event_data in output.events:
-            date_str = getattr(event_data, "date", None)
-            if not date_str:
-                continue
-                
-            # Ensure date is in YYYY-MM-DD format
-            try:
-                # Parse and reformat to ensure consistency
-                parsed_date = datetime.strptime(date_str, "%Y-%m-%d")
-                date_str = parsed_date.strftime("%Y-%m-%d")
-                timestamp = f"{date_str}T00:00:00Z"
-            except ValueError:
-                # Try other date formats
-                try:
-                    parsed_date = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-                    date_str = parsed_date.strftime("%Y-%m-%d")
-                    timestamp = f"{date_str}T00:00:00Z"
-                except:
-                    timestamp = f"{date_str}T00:00:00Z"
-            
-            title = getattr(event_data, "title", None)
-            summary = getattr(event_data, "summary", "") or getattr(event_data, "description", "")
-            
-            # Get citations if available
-            citations = []
-            if hasattr(event_data, "citations") and event_data.citations:
-                for cit in event_data.citations:
-                    citations.append({
-                        "url": getattr(cit, "url", ""),
-                        "title": getattr(cit, "title", None),
-                    })
-            
-            events.append(CriticalEvent(
-                timestamp=timestamp,
-                date=date_str,
-                summary=summary,
-                title=title,
-                citations=citations,
-            ))
-    
-    # If structured parsing failed, try to extract from content
-    if not events and hasattr(output, "content"):
-        content = str(output.content)
+    results = []
+    for ticker in tickers:
+        # Don't format summaries with LLM - keep them concise and plain
+        # The UI already formats them appropriately
+        events = events_by_ticker.get(ticker.strip().upper(), [])
         
-        # Try to parse as JSON first
-        try:
-            import json
-            # Try to find JSON in the content
-            json_match = re.search(r'\{[\s\S]*"events"[\s\S]*\}', content)
-            if json_match:
-                json_data = json.loads(json_match.group())
-                if "events" in json_data:
-                    for event_data in json_data["events"]:
-                        date_str = event_data.get("date", "")
-                        if date_str:
-                            events.append(CriticalEvent(
-                                timestamp=f"{date_str}T00:00:00Z",
-                                date=date_str,
-                                summary=event_data.get("summary", ""),
-                                title=event_data.get("title"),
-                                citations=[],
-                            ))
-        except (json.JSONDecodeError, AttributeError):
-            pass
+        # Sort by date and limit to requested number
+        events.sort(key=lambda e: e.date)
+        events = events[:num_events]
         
-        # If JSON parsing failed, try to extract from markdown/text
-        if not events:
-            # Look for patterns like "1.", "**1.", "#### **1." or numbered events
-            # Split by numbered items or headers
-            event_blocks = re.split(r'(?:^|\n)(?:\#{1,4}\s*)?(?:\*{1,2})?(\d+)[.\)]\s*', content)
-            
-            for i in range(1, len(event_blocks), 2):  # Skip first empty split, process pairs
-                if i + 1 >= len(event_blocks):
-                    break
-                    
-                block = event_blocks[i + 1]
-                
-                # Extract date from block
-                date_match = re.search(r'(\d{4}-\d{2}-\d{2})', block)
-                if not date_match:
-                    # Try other date formats like "November 20, 2023"
-                    month_date_match = re.search(
-                        r'(January|February|March|April|May|June|July|August|September|October|November|December)\s+(\d{1,2}),?\s+(\d{4})',
-                        block, re.IGNORECASE
-                    )
-                    if month_date_match:
-                        month_names = {
-                            'january': '01', 'february': '02', 'march': '03', 'april': '04',
-                            'may': '05', 'june': '06', 'july': '07', 'august': '08',
-                            'september': '09', 'october': '10', 'november': '11', 'december': '12'
-                        }
-                        month = month_names[month_date_match.group(1).lower()]
-                        day = month_date_match.group(2).zfill(2)
-                        year = month_date_match.group(3)
-                        date_str = f"{year}-{month}-{day}"
-                    else:
-                        continue
-                else:
-                    date_str = date_match.group(1)
-                
-                # Extract title - usually the first line or bold text
-                title_match = re.search(r'\*{1,2}([^*]+)\*{1,2}', block[:200])
-                title = title_match.group(1).strip() if title_match else None
-                
-                # Clean up title - remove "Date:", "Title:", etc.
-                if title:
-                    title = re.sub(r'^(Date|Title|Event|Summary):\s*', '', title, flags=re.IGNORECASE)
-                
-                # Extract summary - look for text after "Summary:" or just take the main content
-                summary_match = re.search(r'[Ss]ummary[:\s]+(.+?)(?:\n\n|$)', block, re.DOTALL)
-                if summary_match:
-                    summary = summary_match.group(1).strip()
-                else:
-                    # Take first substantial paragraph
-                    paragraphs = [p.strip() for p in block.split('\n\n') if p.strip()]
-                    summary = paragraphs[0] if paragraphs else block[:300]
-                
-                # Clean up summary - remove markdown formatting
-                summary = re.sub(r'\*{1,2}([^*]+)\*{1,2}', r'\1', summary)
-                summary = re.sub(r'\[([^\]]+)\]\([^\)]+\)', r'\1', summary)  # Remove links
-                summary = summary.strip()[:500]  # Limit length
-                
-                if date_str and summary:
-                    events.append(CriticalEvent(
-                        timestamp=f"{date_str}T00:00:00Z",
-                        date=date_str,
-                        summary=summary,
-                        title=title,
-                        citations=[],
-                    ))
+        results.append(CriticalEventsResult(
+            ticker=ticker,
+            start_date=start_date,
+            end_date=end_date,
+            events=events,
+            run_id=task_run.run_id,
+        ))
     
-    # Don't format summaries with LLM - keep them concise and plain
-    # The UI already formats them appropriately
-    formatted_events = events
-    
-    # Sort by date
-    formatted_events.sort(key=lambda e: e.date)
+    return results
+
+
+async def search_critical_events(
+    ticker: str,
+    start_date: str,
+    end_date: str,
+    num_events: int = 10,
+) -> CriticalEventsResult:
+    """
+    Search for critical events in a time series using Parallel API.
     
-    # Limit to requested number
-    formatted_events = formatted_events[:num_events]
+    The Parallel calls are awaited, so several searches can run at once,
+    e.g. asyncio.gather over tickers under an asyncio.Semaphore to stay
+    within the API's rate limits. For many tickers at once, prefer
+    search_critical_events_batch.
     
-    return CriticalEventsResult(
-        ticker=ticker,
-        start_date=start_date,
-        end_date=end_date,
-        events=formatted_events,
-        run_id=task_run.run_id,
-    )
+    Args:
+        ticker: Stock ticker or series name
+        start_date: Start date of the period (YYYY-MM-DD)
+        end_date: End date of the period (YYYY-MM-DD)
+        num_events: Number of critical events to find (default: 10)
+        
+    Returns:
+        CriticalEventsResult with list of events
+    """
+    results = await search_critical_events_batch([ticker], start_date, end_date, num_events)
+    return results[0]
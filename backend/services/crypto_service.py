@@ -1,12 +1,13 @@
 """Cryptocurrency data service using yfinance library."""
 
-from datetime import datetime
+import functools
 from typing import Optional
 
-import pandas as pd
-import yfinance as yf
 from pydantic import BaseModel
 
+from .cache_utils import YF_CACHE_TTL_SECONDS, load_from_cache, save_to_cache_background
+from .http_session import default_date_range, download_closes
+
 
 class CryptoTimeSeriesData(BaseModel):
     """Crypto time series data response model."""
@@ -37,7 +38,14 @@ CRYPTO_SYMBOLS = {
     'UNI': 'UNI-USD',
 }
 
+# Listing payload is static, so build it once at import
+POPULAR_CRYPTOS = tuple(
+    {"symbol": symbol, "ticker": ticker, "name": symbol}
+    for symbol, ticker in CRYPTO_SYMBOLS.items()
+)
+
 
+@functools.lru_cache(maxsize=4096)
 def normalize_crypto_ticker(ticker: str) -> str:
     """
     Normalize crypto ticker to yfinance format.
@@ -79,39 +87,60 @@ async def fetch_crypto_data(
     """
     # Normalize ticker format
     normalized_ticker = normalize_crypto_ticker(ticker)
+    start_date, end_date = default_date_range(start_date, end_date)
     
-    # Default to last 5 years if no dates provided
-    if not start_date:
-        start_date = (datetime.now() - pd.DateOffset(years=5)).strftime("%Y-%m-%d")
-    if not end_date:
-        end_date = datetime.now().strftime("%Y-%m-%d")
+    cache_key = f"crypto:{normalized_ticker}:{start_date}:{end_date}"
+    cached_data = load_from_cache(cache_key, max_age=YF_CACHE_TTL_SECONDS)
+    if cached_data:
+        return CryptoTimeSeriesData(**cached_data)
     
-    # Fetch data using yfinance
-    crypto = yf.Ticker(normalized_ticker)
-    df = crypto.history(start=start_date, end=end_date)
-    
-    if df.empty:
-        raise ValueError(f"No data found for crypto ticker: {ticker} (normalized: {normalized_ticker})")
+    (result,) = await fetch_crypto_batch([normalized_ticker], start_date, end_date)
+    save_to_cache_background(cache_key, result.model_dump())
+    return result
+
+
+async def fetch_crypto_batch(
+    tickers: list[str],
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+) -> list[CryptoTimeSeriesData]:
+    """
+    Fetch several cryptocurrencies from Yahoo Finance in one download.
     
-    # Reset index to get dates as column
-    df = df.reset_index()
+    Args:
+        tickers: Crypto ticker symbols (e.g., ['BTC', 'ETH-USD'])
+        start_date: Start date in YYYY-MM-DD format
+        end_date: End date in YYYY-MM-DD format
+        
+    Returns:
+        CryptoTimeSeriesData per ticker that returned data, in input order
+    """
+    # Normalize ticker formats, dropping duplicates
+    normalized_tickers = list(dict.fromkeys(normalize_crypto_ticker(t) for t in tickers))
+    if not normalized_tickers:
+        return []
     
-    # Convert timestamps to ISO format strings
-    timestamps = df["Date"].dt.strftime("%Y-%m-%dT%H:%M:%S").tolist()
-    values = df["Close"].tolist()
+    start_date, end_date = default_date_range(start_date, end_date)
+    closes = await download_closes(normalized_tickers, start_date, end_date)
+    if not closes:
+        raise ValueError(f"No data found for crypto ticker: {', '.join(normalized_tickers)}")
     
-    # Extract currency pair
-    currency = "USD"
-    if '-' in normalized_ticker:
-        currency = normalized_ticker.split('-')[1]
+    results = []
+    for normalized_ticker, (timestamps, values) in closes.items():
+        # Extract currency pair
+        currency = "USD"
+        if '-' in normalized_ticker:
+            currency = normalized_ticker.split('-')[1]
+        
+        results.append(CryptoTimeSeriesData(
+            ticker=normalized_ticker,
+            timestamps=timestamps,
+            values=values,
+            data_type="close",
+            currency=currency
+        ))
     
-    return CryptoTimeSeriesData(
-        ticker=normalized_ticker,
-        timestamps=timestamps,
-        values=values,
-        data_type="close",
-        currency=currency
-    )
+    return results
 
 
 async def list_popular_cryptos():
@@ -121,7 +150,4 @@ async def list_popular_cryptos():
     Returns:
         List of popular crypto symbols with their tickers
     """
-    return [
-        {"symbol": symbol, "ticker": ticker, "name": symbol}
-        for symbol, ticker in CRYPTO_SYMBOLS.items()
-    ]
+    return POPULAR_CRYPTOS
@@ -1,12 +1,13 @@
 """Forex (Foreign Exchange) data service using yfinance library."""
 
-from datetime import datetime
+import functools
 from typing import Optional
 
-import pandas as pd
-import yfinance as yf
 from pydantic import BaseModel
 
+from .cache_utils import YF_CACHE_TTL_SECONDS, load_from_cache, save_to_cache_background
+from .http_session import default_date_range, download_closes
+
 
 class ForexTimeSeriesData(BaseModel):
     """Forex time series data response model."""
@@ -38,7 +39,19 @@ FOREX_PAIRS = {
     'GBPCAD': 'GBPCAD=X',
 }
 
+# Listing payload is static, so build it once at import
+POPULAR_FOREX_PAIRS = tuple(
+    {
+        "pair": pair,
+        "ticker": ticker,
+        "base": pair[:3],
+        "quote": pair[3:6],
+    }
+    for pair, ticker in FOREX_PAIRS.items()
+)
+
 
+@functools.lru_cache(maxsize=4096)
 def normalize_forex_ticker(ticker: str) -> tuple[str, str, str]:
     """
     Normalize forex ticker to yfinance format.
@@ -97,36 +110,61 @@ async def fetch_forex_data(
         ForexTimeSeriesData with timestamps and exchange rates
     """
     # Normalize ticker format
-    yf_ticker, base_currency, quote_currency = normalize_forex_ticker(ticker)
-    
-    # Default to last 5 years if no dates provided
-    if not start_date:
-        start_date = (datetime.now() - pd.DateOffset(years=5)).strftime("%Y-%m-%d")
-    if not end_date:
-        end_date = datetime.now().strftime("%Y-%m-%d")
-    
-    # Fetch data using yfinance
-    forex = yf.Ticker(yf_ticker)
-    df = forex.history(start=start_date, end=end_date)
+    yf_ticker, _, _ = normalize_forex_ticker(ticker)
+    start_date, end_date = default_date_range(start_date, end_date)
     
-    if df.empty:
-        raise ValueError(f"No data found for forex pair: {ticker} (normalized: {yf_ticker})")
+    cache_key = f"forex:{yf_ticker}:{start_date}:{end_date}"
+    cached_data = load_from_cache(cache_key, max_age=YF_CACHE_TTL_SECONDS)
+    if cached_data:
+        return ForexTimeSeriesData(**cached_data)
     
-    # Reset index to get dates as column
-    df = df.reset_index()
-    
-    # Convert timestamps to ISO format strings
-    timestamps = df["Date"].dt.strftime("%Y-%m-%dT%H:%M:%S").tolist()
-    values = df["Close"].tolist()
+    (result,) = await fetch_forex_batch([ticker], start_date, end_date)
+    save_to_cache_background(cache_key, result.model_dump())
+    return result
+
+
+async def fetch_forex_batch(
+    tickers: list[str],
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+) -> list[ForexTimeSeriesData]:
+    """
+    Fetch several forex pairs from Yahoo Finance in one download.
     
-    return ForexTimeSeriesData(
-        ticker=yf_ticker,
-        base_currency=base_currency,
-        quote_currency=quote_currency,
-        timestamps=timestamps,
-        values=values,
-        data_type="close"
-    )
+    Args:
+        tickers: Forex pairs (e.g., ['EURUSD', 'GBP/USD'])
+        start_date: Start date in YYYY-MM-DD format
+        end_date: End date in YYYY-MM-DD format
+        
+    Returns:
+        ForexTimeSeriesData per pair that returned data, in input order
+    """
+    # Normalize ticker formats, dropping duplicates
+    pairs = {}
+    for ticker in tickers:
+        yf_ticker, base_currency, quote_currency = normalize_forex_ticker(ticker)
+        pairs.setdefault(yf_ticker, (base_currency, quote_currency))
+    if not pairs:
+        return []
+    
+    start_date, end_date = default_date_range(start_date, end_date)
+    closes = await download_closes(list(pairs), start_date, end_date)
+    if not closes:
+        raise ValueError(f"No data found for forex pair: {', '.join(pairs)}")
+    
+    results = []
+    for yf_ticker, (timestamps, values) in closes.items():
+        base_currency, quote_currency = pairs[yf_ticker]
+        results.append(ForexTimeSeriesData(
+            ticker=yf_ticker,
+            base_currency=base_currency,
+            quote_currency=quote_currency,
+            timestamps=timestamps,
+            values=values,
+            data_type="close"
+        ))
+    
+    return results
 
 
 async def list_popular_forex_pairs():
@@ -136,12 +174,4 @@ async def list_popular_forex_pairs():
     Returns:
         List of popular forex pairs with their tickers
     """
-    return [
-        {
-            "pair": pair,
-            "ticker": ticker,
-            "base": pair[:3],
-            "quote": pair[3:6],
-        }
-        for pair, ticker in FOREX_PAIRS.items()
-    ]
+    return POPULAR_FOREX_PAIRS
@@ -3,6 +3,9 @@
 import os
 from typing import Any, Optional
 
+import numpy as np
+import orjson
+import pandas as pd
 from pydantic import BaseModel
 
 
@@ -34,40 +37,13 @@ class HaverTimeSeriesData(BaseModel):
     values: list[float]
 
 
-import json
-import hashlib
-from pathlib import Path
+from .cache_utils import load_from_cache, save_to_cache_background
 
-# File-based cache setup
-CACHE_DIR = Path(".cache")
-CACHE_DIR.mkdir(exist_ok=True)
-
-def get_cache_path(key: str) -> Path:
-    """Generate a safe file path for a cache key."""
-    # Use MD5 hash of the key to generate a safe filename
-    safe_key = hashlib.md5(key.encode()).hexdigest()
-    return CACHE_DIR / f"{safe_key}.json"
-
-def load_from_cache(key: str) -> Optional[Any]:
-    """Load data from cache if it exists."""
-    cache_path = get_cache_path(key)
-    if cache_path.exists():
-        try:
-            with open(cache_path, "r") as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"DEBUG: Failed to load cache for {key}: {e}")
-            return None
-    return None
-
-def save_to_cache(key: str, data: Any):
-    """Save data to cache."""
-    cache_path = get_cache_path(key)
-    try:
-        with open(cache_path, "w") as f:
-            json.dump(data, f)
-    except Exception as e:
-        print(f"DEBUG: Failed to save cache for {key}: {e}")
+# In-process memo in front of the file cache, holding ready-built models
+_SERIES_MEM: dict[str, list[HaverSeries]] = {}
+_DATA_MEM: dict[tuple[str, str], HaverTimeSeriesData] = {}
+# Per database: series name -> (description, currency)
+_SERIES_INFO_MEM: dict[str, dict[str, tuple[str, Optional[str]]]] = {}
 
 
 def get_haver_client():
@@ -108,13 +84,19 @@ async def list_series(database: str) -> list[HaverSeries]:
         List of HaverSeries with metadata
     """
     print(f"DEBUG: list_series called for {database}")
+    if database in _SERIES_MEM:
+        return _SERIES_MEM[database]
+    
     cache_key = f"series:{database}"
     
     cached_data = load_from_cache(cache_key)
     if cached_data:
         print(f"DEBUG: Cache HIT for {cache_key} (file)")
-        # Deserialize JSON back to HaverSeries objects
-        return [HaverSeries(**item) for item in cached_data]
+        # Deserialize cached dicts back to HaverSeries objects; the entries
+        # were validated before they were written, so skip validation here
+        result = [HaverSeries.model_construct(**item) for item in cached_data]
+        _SERIES_MEM[database] = result
+        return result
         
     print(f"DEBUG: Cache MISS for {cache_key}, fetching from Haver...")
     
@@ -152,8 +134,9 @@ async def list_series(database: str) -> list[HaverSeries]:
                 ))
         
         print(f"DEBUG: Caching {len(result)} series for {database}")
-        # Serialize objects to dicts for JSON storage
-        save_to_cache(cache_key, [s.model_dump() for s in result])
+        # Serialize objects to dicts for storage
+        save_to_cache_background(cache_key, [s.model_dump() for s in result])
+        _SERIES_MEM[database] = result
         return result
     except Exception as e:
         print(f"DEBUG: Error in list_series: {e}")
@@ -162,143 +145,183 @@ async def list_series(database: str) -> list[HaverSeries]:
 
 import re
 
-async def fetch_haver_data(database: str, series: str) -> HaverTimeSeriesData:
+# Currency/unit in parentheses at the end of a series description
+_CURRENCY_RE = re.compile(r'\(([^)]+)\)$')
+
+
+async def get_series_info(database: str) -> dict[str, tuple[str, Optional[str]]]:
     """
-    Fetch time series data from Haver Analytics.
+    Map each series in a database to its description and currency/unit.
     
     Args:
         database: Database code (e.g., 'USECON')
-        series: Series name (e.g., 'N997CE')
         
     Returns:
-        HaverTimeSeriesData with timestamps and values
+        Dict of series name -> (description, currency)
     """
-    print(f"DEBUG: fetch_haver_data called for {database}/{series}")
-    cache_key = f"data:{database}:{series}"
+    if database in _SERIES_INFO_MEM:
+        return _SERIES_INFO_MEM[database]
     
-    cached_data = load_from_cache(cache_key)
-    if cached_data:
-        print(f"DEBUG: Cache HIT for {cache_key} (file)")
-        return HaverTimeSeriesData(**cached_data)
+    info = {}
+    for s in await list_series(database):
+        # Extract currency/unit from parentheses at end of description
+        # e.g., "Gross Domestic Product (Mil.Euros)" -> "Mil.Euros"
+        match = _CURRENCY_RE.search(s.description)
+        info[s.name] = (s.description, match.group(1) if match else None)
+    
+    _SERIES_INFO_MEM[database] = info
+    return info
 
-    print(f"DEBUG: Cache MISS for {cache_key}")
+
+async def _read_haver_arrays(database: str, series: str) -> tuple[str, Optional[str], Any, np.ndarray]:
+    """
+    Read a Haver series into arrays, without building Python lists.
     
-    try:
-        # Fetch series metadata to get description
-        series_list = await list_series(database)
-        description = ""
-        currency = None
+    Args:
+        database: Database code (e.g., 'USECON')
+        series: Series name (e.g., 'N997CE')
         
-        for s in series_list:
-            if s.name == series:
-                description = s.description
-                # Extract currency/unit from parentheses at end of description
-                # e.g., "Gross Domestic Product (Mil.Euros)" -> "Mil.Euros"
-                match = re.search(r'\(([^)]+)\)$', description)
-                if match:
-                    currency = match.group(1)
-                break
+    Returns:
+        Tuple of (description, currency, timestamps, values). Timestamps are a
+        datetime64[s] array, or a list of strings if they could not be parsed.
+    """
+    # Fetch series metadata to get description
+    series_info = await get_series_info(database)
+    description, currency = series_info.get(series, ("", None))
 
-        haver = get_haver_client()
-        
-        # Construct Haver code as "series@database"
-        haver_code = f"{series}@{database}"
-        
-        df = haver.read_df(haver_codes=[haver_code])
-        
-        if df is None or df.empty:
-            print(f"DEBUG: No data found for {haver_code}")
-            raise ValueError(f"No data found for Haver code: {haver_code}")
-            
-        print(f"DEBUG: DataFrame columns: {df.columns}")
-        print(f"DEBUG: DataFrame index: {df.index}")
-        print(f"DEBUG: DataFrame head:\n{df.head()}")
-        
-        # Handle timestamp column
-        timestamp_col = None
+    haver = get_haver_client()
+    
+    # Construct Haver code as "series@database"
+    haver_code = f"{series}@{database}"
+    
+    df = haver.read_df(haver_codes=[haver_code])
+    
+    if df is None or df.empty:
+        print(f"DEBUG: No data found for {haver_code}")
+        raise ValueError(f"No data found for Haver code: {haver_code}")
         
-        # 1. Check if index is DatetimeIndex
-        if isinstance(df.index, pd.DatetimeIndex):
-            df = df.reset_index()
-            timestamp_col = df.columns[0] # formatted index becomes first col
-            print(f"DEBUG: Using DatetimeIndex as timestamp (col: {timestamp_col})")
-        # 2. Check if index is PeriodIndex
-        elif isinstance(df.index, pd.PeriodIndex):
-            df.index = df.index.to_timestamp()
+    print(f"DEBUG: DataFrame columns: {df.columns}")
+    print(f"DEBUG: DataFrame index: {df.index}")
+    print(f"DEBUG: DataFrame head:\n{df.head()}")
+    
+    # Handle timestamp column
+    timestamp_col = None
+    
+    # 1. Check if index is DatetimeIndex
+    if isinstance(df.index, pd.DatetimeIndex):
+        df = df.reset_index()
+        timestamp_col = df.columns[0] # formatted index becomes first col
+        print(f"DEBUG: Using DatetimeIndex as timestamp (col: {timestamp_col})")
+    # 2. Check if index is PeriodIndex
+    elif isinstance(df.index, pd.PeriodIndex):
+        df.index = df.index.to_timestamp()
+        df = df.reset_index()
+        timestamp_col = df.columns[0]
+        print(f"DEBUG: Using PeriodIndex converted to timestamp (col: {timestamp_col})")
+    else:
+        # If index has a name that looks like date, use it
+        if df.index.name and df.index.name.lower() in ['date', 'time', 'year', 'period']:
             df = df.reset_index()
             timestamp_col = df.columns[0]
-            print(f"DEBUG: Using PeriodIndex converted to timestamp (col: {timestamp_col})")
+            print(f"DEBUG: Using named index '{timestamp_col}' as timestamp")
         else:
-            # If index has a name that looks like date, use it
-            if df.index.name and df.index.name.lower() in ['date', 'time', 'year', 'period']:
-                df = df.reset_index()
-                timestamp_col = df.columns[0]
-                print(f"DEBUG: Using named index '{timestamp_col}' as timestamp")
+            # Reset index to make it a column, but don't assume it's the timestamp yet
+            # unless it was the only option
+            df_reset = df.reset_index()
+            
+            # Look for specific column names
+            candidates = [c for c in df_reset.columns if str(c).lower() in ['date', 'time', 'year', 'period']]
+            if candidates:
+                timestamp_col = candidates[0]
+                df = df_reset
+                print(f"DEBUG: Found timestamp column by name: {timestamp_col}")
             else:
-                # Reset index to make it a column, but don't assume it's the timestamp yet
-                # unless it was the only option
-                df_reset = df.reset_index()
-                
-                # Look for specific column names
-                candidates = [c for c in df_reset.columns if str(c).lower() in ['date', 'time', 'year', 'period']]
-                if candidates:
-                    timestamp_col = candidates[0]
+                # Check for datetime dtype columns
+                dt_cols = df_reset.select_dtypes(include=['datetime', 'datetimetz']).columns
+                if not dt_cols.empty:
+                    timestamp_col = dt_cols[0]
                     df = df_reset
-                    print(f"DEBUG: Found timestamp column by name: {timestamp_col}")
+                    print(f"DEBUG: Found timestamp column by dtype: {timestamp_col}")
                 else:
-                    # Check for datetime dtype columns
-                    dt_cols = df_reset.select_dtypes(include=['datetime', 'datetimetz']).columns
-                    if not dt_cols.empty:
-                        timestamp_col = dt_cols[0]
+                    # Fallback: Check first column of original df (if it wasn't the index)
+                    # If df had index, df_reset has 'index' at col 0.
+                    # Usually Haver returns data where index is date.
+                    # If index was RangeIndex, then it's useless.
+                    # If we are here, index was not Datetime/Period and didn't have date name.
+                    
+                    # Let's try to use the first column of the RESET dataframe if it looks like years
+                    first_col = df_reset.columns[0]
+                    if pd.api.types.is_integer_dtype(df_reset[first_col]):
+                         # check values range in one pass over the raw buffer
+                         vals = df_reset[first_col].to_numpy()
+                         if np.all((vals > 1900) & (vals < 2100)):
+                             timestamp_col = first_col
+                             df = df_reset
+                             print(f"DEBUG: First column '{timestamp_col}' looks like years")
+                    
+                    if not timestamp_col:
+                        # Absolute fallback: use first column of reset df
                         df = df_reset
-                        print(f"DEBUG: Found timestamp column by dtype: {timestamp_col}")
-                    else:
-                        # Fallback: Check first column of original df (if it wasn't the index)
-                        # If df had index, df_reset has 'index' at col 0.
-                        # Usually Haver returns data where index is date.
-                        # If index was RangeIndex, then it's useless.
-                        # If we are here, index was not Datetime/Period and didn't have date name.
-                        
-                        # Let's try to use the first column of the RESET dataframe if it looks like years
-                        first_col = df_reset.columns[0]
-                        if pd.api.types.is_integer_dtype(df_reset[first_col]):
-                             # check values range
-                             vals = df_reset[first_col]
-                             if vals.min() > 1900 and vals.max() < 2100:
-                                 timestamp_col = first_col
-                                 df = df_reset
-                                 print(f"DEBUG: First column '{timestamp_col}' looks like years")
-                        
-                        if not timestamp_col:
-                            # Absolute fallback: use first column of reset df
-                            df = df_reset
-                            timestamp_col = df.columns[0]
-                            print(f"DEBUG: Fallback to first column '{timestamp_col}' as timestamp")
+                        timestamp_col = df.columns[0]
+                        print(f"DEBUG: Fallback to first column '{timestamp_col}' as timestamp")
 
-        print(f"DEBUG: Selected timestamp column: {timestamp_col}")
-        print(f"DEBUG: First few raw timestamps: {df[timestamp_col].head().tolist()}")
-        
-        # Find value column
-        value_col = "value" if "value" in df.columns else [c for c in df.columns if c != timestamp_col][0]
-        
-        import pandas as pd
+    print(f"DEBUG: Selected timestamp column: {timestamp_col}")
+    print(f"DEBUG: First few raw timestamps: {df[timestamp_col].head().tolist()}")
+    
+    # Find value column
+    value_col = "value" if "value" in df.columns else [c for c in df.columns if c != timestamp_col][0]
+    
+    # Convert timestamps to ISO format strings
+    try:
+        # Check if timestamps are integers (likely years)
+        if pd.api.types.is_integer_dtype(df[timestamp_col]):
+            print("DEBUG: Detected integer timestamps, treating as years")
+            dt_series = pd.to_datetime(df[timestamp_col], format="%Y")
+        else:
+            # Try to convert to datetime objects first
+            dt_series = pd.to_datetime(df[timestamp_col])
         
-        # Convert timestamps to ISO format strings
-        try:
-            # Check if timestamps are integers (likely years)
-            if pd.api.types.is_integer_dtype(df[timestamp_col]):
-                print("DEBUG: Detected integer timestamps, treating as years")
-                dt_series = pd.to_datetime(df[timestamp_col].astype(str), format="%Y")
-            else:
-                # Try to convert to datetime objects first
-                dt_series = pd.to_datetime(df[timestamp_col])
-            
-            timestamps = dt_series.dt.strftime("%Y-%m-%dT%H:%M:%S").tolist()
-        except Exception as e:
-            print(f"DEBUG: Failed to convert to datetime: {e}. Using string representation.")
-            timestamps = [str(t) for t in df[timestamp_col].tolist()]
+        if dt_series.dt.tz is not None:
+            dt_series = dt_series.dt.tz_localize(None)
+        timestamps = dt_series.to_numpy(dtype="datetime64[s]")
+    except Exception as e:
+        print(f"DEBUG: Failed to convert to datetime: {e}. Using string representation.")
+        timestamps = [str(t) for t in df[timestamp_col].tolist()]
+    
+    values = df[value_col].to_numpy(dtype=np.float64)
+    return description, currency, timestamps, values
+
+
+async def fetch_haver_data(database: str, series: str) -> HaverTimeSeriesData:
+    """
+    Fetch time series data from Haver Analytics.
+    
+    Args:
+        database: Database code (e.g., 'USECON')
+        series: Series name (e.g., 'N997CE')
         
-        values = df[value_col].tolist()
+    Returns:
+        HaverTimeSeriesData with timestamps and values
+    """
+    print(f"DEBUG: fetch_haver_data called for {database}/{series}")
+    if (database, series) in _DATA_MEM:
+        return _DATA_MEM[(database, series)]
+    
+    cache_key = f"data:{database}:{series}"
+    
+    cached_data = load_from_cache(cache_key)
+    if cached_data:
+        print(f"DEBUG: Cache HIT for {cache_key} (file)")
+        result = HaverTimeSeriesData.model_construct(**cached_data)
+        _DATA_MEM[(database, series)] = result
+        return result
+
+    print(f"DEBUG: Cache MISS for {cache_key}")
+    
+    try:
+        description, currency, timestamps, values = await _read_haver_arrays(database, series)
+        if isinstance(timestamps, np.ndarray):
+            timestamps = timestamps.astype(str).tolist()
         
         result = HaverTimeSeriesData(
             database=database,
@@ -306,13 +329,63 @@ async def fetch_haver_data(database: str, series: str) -> HaverTimeSeriesData:
             description=description,
             currency=currency,
             timestamps=timestamps,
-            values=values,
+            values=values.tolist(),
         )
         
-        save_to_cache(cache_key, result.model_dump())
+        save_to_cache_background(cache_key, result.model_dump())
+        _DATA_MEM[(database, series)] = result
         print(f"DEBUG: Cached data for {cache_key} ({len(timestamps)} points)")
         return result
     except Exception as e:
         print(f"DEBUG: Error in fetch_haver_data: {e}")
         raise
 
+
+async def fetch_haver_data_bytes(database: str, series: str) -> bytes:
+    """
+    Fetch a Haver series as a ready-to-send JSON body.
+    
+    Serializes the arrays straight to JSON, skipping the Python lists and
+    model validation of fetch_haver_data. Use the latter for internal callers.
+    
+    Args:
+        database: Database code (e.g., 'USECON')
+        series: Series name (e.g., 'N997CE')
+        
+    Returns:
+        JSON bytes with the same shape as HaverTimeSeriesData
+    """
+    if (database, series) in _DATA_MEM:
+        return orjson.dumps(_DATA_MEM[(database, series)].model_dump())
+    
+    cache_key = f"json:{database}:{series}"
+    
+    cached_data = load_from_cache(cache_key)
+    if cached_data:
+        print(f"DEBUG: Cache HIT for {cache_key} (file)")
+        return cached_data
+    
+    cached_data = load_from_cache(f"data:{database}:{series}")
+    if cached_data:
+        return orjson.dumps(cached_data)
+    
+    try:
+        description, currency, timestamps, values = await _read_haver_arrays(database, series)
+        result = orjson.dumps(
+            {
+                "database": database,
+                "series": series,
+                "description": description,
+                "currency": currency,
+                "timestamps": timestamps,
+                "values": values,
+            },
+            option=orjson.OPT_SERIALIZE_NUMPY,
+        )
+        
+        save_to_cache_background(cache_key, result)
+        print(f"DEBUG: Cached data for {cache_key} ({len(values)} points)")
+        return result
+    except Exception as e:
+        print(f"DEBUG: Error in fetch_haver_data_bytes: {e}")
+        raise
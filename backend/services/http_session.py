@@ -0,0 +1,110 @@
+"""Shared HTTP session and download helper for Yahoo Finance requests."""
+
+import asyncio
+import functools
+from datetime import datetime, timedelta
+from typing import Optional
+
+import numpy as np
+import yfinance as yf
+from curl_cffi import requests as curl_requests
+from curl_cffi.requests.session import RetryStrategy
+
+# Upper bound on worker threads yfinance uses for a multi-symbol download
+YF_DOWNLOAD_THREADS = 8
+
+# Transient failures are retried with exponential backoff (0.3s, 0.6s, 1.2s)
+YF_RETRY = RetryStrategy(count=3, delay=0.3, backoff="exponential")
+
+# Default history window; ignores leap days, which is fine for "last 5 years"
+DEFAULT_LOOKBACK = timedelta(days=5 * 365)
+
+
+@functools.lru_cache(maxsize=1)
+def get_yf_session() -> curl_requests.Session:
+    """
+    Get the process-wide session passed to every yfinance call.
+    
+    yfinance relies on curl_cffi's browser impersonation to get past Yahoo's
+    bot checks, so this is a curl_cffi Session rather than a requests Session
+    with an HTTPAdapter. Each worker thread keeps
+    its own curl handle and connection cache on it.
+    
+    Returns:
+        Shared curl_cffi Session
+    """
+    return curl_requests.Session(impersonate="chrome", retry=YF_RETRY)
+
+
+def default_date_range(start_date: Optional[str], end_date: Optional[str]) -> tuple[str, str]:
+    """
+    Fill in a missing start or end date, defaulting to the last 5 years.
+    
+    Args:
+        start_date: Start date in YYYY-MM-DD format, or None
+        end_date: End date in YYYY-MM-DD format, or None
+    
+    Returns:
+        Tuple of (start_date, end_date) in YYYY-MM-DD format
+    """
+    now = datetime.now()
+    if not start_date:
+        start_date = (now - DEFAULT_LOOKBACK).strftime("%Y-%m-%d")
+    if not end_date:
+        end_date = now.strftime("%Y-%m-%d")
+    return start_date, end_date
+
+
+async def download_closes(
+    symbols: list[str],
+    start_date: str,
+    end_date: str,
+) -> dict[str, tuple[list[str], list[float]]]:
+    """
+    Download daily closing prices for several symbols in one yfinance call.
+    
+    yfinance fetches the symbols concurrently on its own thread pool. It
+    upper-cases every symbol, so each one is looked up upper-cased in the result.
+    
+    Args:
+        symbols: yfinance symbols (e.g., ['NVDA', 'BTC-USD', 'EURUSD=X'])
+        start_date: Start date in YYYY-MM-DD format
+        end_date: End date in YYYY-MM-DD format
+    
+    Returns:
+        (timestamps, closes) per symbol that returned data, keyed by the
+        symbol as given, in input order
+    """
+    if not symbols:
+        return {}
+    
+    df = await asyncio.to_thread(
+        yf.download,
+        symbols,
+        start=start_date,
+        end=end_date,
+        group_by="ticker",
+        threads=YF_DOWNLOAD_THREADS,
+        session=get_yf_session(),
+        progress=False,
+    )
+    
+    closes = {}
+    downloaded = set(df.columns.get_level_values(0)) if df is not None and not df.empty else set()
+    for symbol in symbols:
+        column = symbol.upper()
+        if column not in downloaded:
+            continue
+        sub = df[column].dropna(subset=["Close"])
+        if sub.empty:
+            continue
+        
+        # Convert timestamps to ISO format strings, keeping the exchange's wall time
+        dates = sub.index
+        if dates.tz is not None:
+            dates = dates.tz_localize(None)
+        timestamps = dates.to_numpy(dtype="datetime64[s]").astype(str).tolist()
+        values = sub["Close"].to_numpy(dtype=np.float64).tolist()
+        closes[symbol] = (timestamps, values)
+    
+    return closes
@@ -0,0 +1,42 @@
+"""Shared client for the Parallel API."""
+
+import functools
+import os
+
+# Connection pool size for the shared Parallel client
+PARALLEL_MAX_CONNECTIONS = int(os.getenv("PARALLEL_MAX_CONNECTIONS", "10"))
+
+
+@functools.lru_cache(maxsize=1)
+def get_parallel_client():
+    """
+    Get the shared async Parallel client, creating it on first use.
+    
+    Returns:
+        AsyncParallel client whose connection pool is reused across requests
+    """
+    import httpx
+    from parallel import AsyncParallel, DefaultAsyncHttpxClient
+    
+    api_key = os.getenv("PARALLEL_API_KEY")
+    if not api_key:
+        raise ValueError("PARALLEL_API_KEY environment variable not set")
+    
+    return AsyncParallel(
+        api_key=api_key,
+        http_client=DefaultAsyncHttpxClient(
+            limits=httpx.Limits(
+                max_connections=PARALLEL_MAX_CONNECTIONS,
+                max_keepalive_connections=PARALLEL_MAX_CONNECTIONS,
+            ),
+        ),
+    )
+
+
+async def close_parallel_client():
+    """Close the shared Parallel client, e.g. on application shutdown."""
+    if get_parallel_client.cache_info().currsize == 0:
+        return
+    client = get_parallel_client()
+    get_parallel_client.cache_clear()
+    await client.close()
@@ -1,10 +1,15 @@
 """Parallel API search service for time series event explanation."""
 
-import os
+import asyncio
 from typing import Optional
 
 from pydantic import BaseModel
-from .text_formatter import format_text_with_llm
+from .parallel_client import get_parallel_client
+from .text_formatter import format_texts_batch
+
+# Server-side wait for a task result, plus local slack before giving up
+TASK_RESULT_TIMEOUT_SECONDS = 120
+TASK_RESULT_GRACE_SECONDS = 5
 
 
 class Citation(BaseModel):
@@ -53,14 +58,9 @@ async def search_time_series_event(
     Returns:
         SearchResult with explanation and citations
     """
-    from parallel import Parallel
     from parallel.types import TaskSpecParam
     
-    api_key = os.getenv("PARALLEL_API_KEY")
-    if not api_key:
-        raise ValueError("PARALLEL_API_KEY environment variable not set")
-    
-    client = Parallel(api_key=api_key)
+    client = get_parallel_client()
     
     # Construct contextual search query
     search_input = f"""
@@ -75,7 +75,7 @@ Please search for news, events, or factors that could explain what happened to {
 """
     
     # Create task run
-    task_run = client.task_run.create(
+    task_run = await client.task_run.create(
         input=search_input,
         task_spec=TaskSpecParam(
             output_schema=f"A detailed explanation of why {ticker} changed during {start_date} to {end_date}, including specific events, news, or market factors."
@@ -83,50 +83,46 @@ Please search for news, events, or factors that could explain what happened to {
         processor="base"
     )
     
-    # Wait for result (with timeout)
-    run_result = client.task_run.result(task_run.run_id, api_timeout=120)
+    # Wait for result; the local deadline cancels the request even if the
+    # server-side timeout is not honoured
+    run_result = await asyncio.wait_for(
+        client.task_run.result(task_run.run_id, api_timeout=TASK_RESULT_TIMEOUT_SECONDS),
+        timeout=TASK_RESULT_TIMEOUT_SECONDS + TASK_RESULT_GRACE_SECONDS,
+    )
     
     # Parse output
     output = run_result.output
     
-    # Build citations list
-    citations = []
-    basis_list = []
+    basis_items = output.basis if hasattr(output, "basis") and output.basis else []
     
-    if hasattr(output, "basis") and output.basis:
-        for basis_item in output.basis:
-            basis_citations = []
-            if hasattr(basis_item, "citations") and basis_item.citations:
-                for cit in basis_item.citations:
-                    basis_citations.append(Citation(
-                        title=getattr(cit, "title", None),
-                        url=getattr(cit, "url", ""),
-                        excerpts=getattr(cit, "excerpts", []),
-                    ))
-            
-            basis_list.append(SearchBasis(
-                field=getattr(basis_item, "field", "output"),
-                citations=basis_citations,
-                reasoning=getattr(basis_item, "reasoning", ""),
-                confidence=getattr(basis_item, "confidence", ""),
-            ))
-    
-    # Format the content with LLM for better readability
+    # Format the content and every reasoning section with one LLM request
     raw_content = output.content if hasattr(output, "content") else str(output)
-    formatted_content = await format_text_with_llm(raw_content)
+    formatted = await format_texts_batch(
+        [raw_content] + [getattr(basis_item, "reasoning", "") for basis_item in basis_items]
+    )
+    formatted_content = formatted[0]
     
-    # Also format reasoning sections
+    # Build each basis entry once, with its formatted reasoning
     formatted_basis = []
-    for basis_item in basis_list:
-        formatted_reasoning = await format_text_with_llm(basis_item.reasoning) if basis_item.reasoning else basis_item.reasoning
+    for basis_item, formatted_reasoning in zip(basis_items, formatted[1:]):
+        basis_citations = []
+        if hasattr(basis_item, "citations") and basis_item.citations:
+            for cit in basis_item.citations:
+                basis_citations.append(Citation(
+                    title=getattr(cit, "title", None),
+                    url=getattr(cit, "url", ""),
+                    excerpts=getattr(cit, "excerpts", []),
+                ))
+        
         formatted_basis.append(SearchBasis(
-            field=basis_item.field,
-            citations=basis_item.citations,
+            field=getattr(basis_item, "field", "output"),
+            citations=basis_citations,
             reasoning=formatted_reasoning,
-            confidence=basis_item.confidence,
+            confidence=getattr(basis_item, "confidence", ""),
         ))
     
-    return SearchResult(
+    # The basis entries were validated above, so skip re-validating them here
+    return SearchResult.model_construct(
         run_id=task_run.run_id,
         status=run_result.run.status,
         content=formatted_content,
@@ -1,8 +1,131 @@
 """Text formatting service using OpenAI to improve readability."""
 
+import asyncio
+import hashlib
 import os
+import re
+from collections import OrderedDict
 from typing import Optional
 
+# Upper bound on concurrent formatting requests sent to OpenAI
+MAX_CONCURRENT_FORMAT_REQUESTS = 8
+_format_semaphore = asyncio.Semaphore(MAX_CONCURRENT_FORMAT_REQUESTS)
+
+# Formatted results keyed by a hash of the input text, evicted least recently used
+FORMAT_CACHE_MAX_ENTRIES = 1024
+# Shorter text is returned as is; formatting adds little to it
+MIN_FORMAT_LENGTH = 100
+
+_format_cache: "OrderedDict[str, str]" = OrderedDict()
+
+# Shared OpenAI client, created on first use and kept open so its
+# connection pool survives across requests
+_openai_client = None
+
+# Completion budget per formatted item, and the model's output ceiling
+MAX_TOKENS_PER_ITEM = 2000
+MAX_COMPLETION_TOKENS = 16000
+
+# The rules live in the system message so every request shares a byte-identical
+# prefix, which OpenAI's prompt caching can reuse
+SYSTEM_PROMPT = """You are a financial analysis text formatter. Rewrite text with markdown so it is more readable and digestible.
+
+Rules:
+1. Use **bold** for key metrics, percentages, dates, and important numbers
+2. Use *italics* for emphasis on important concepts
+3. Break long paragraphs into shorter, digestible chunks
+4. Add bullet points or numbered lists where appropriate
+5. Highlight critical information (price changes, percentages, dates) with **bold**
+6. Keep the original meaning and facts intact
+7. Use markdown formatting only (no HTML)
+8. Make key statistics stand out with **bold**
+
+Return only the formatted markdown, no explanations."""
+
+# Delimits items in a batched prompt and its response
+_ITEM_MARKER_RE = re.compile(r'^===ITEM (\d+)===[ \t]*$', re.MULTILINE)
+
+
+class _ReplyTruncated(ValueError):
+    """The completion stopped at its token limit before the reply was finished."""
+
+
+def _get_openai_client(api_key: str):
+    """Get the shared async OpenAI client, reusing its connection pool."""
+    global _openai_client
+    from openai import AsyncOpenAI
+    
+    if _openai_client is None or _openai_client.api_key != api_key:
+        _openai_client = AsyncOpenAI(api_key=api_key)
+    return _openai_client
+
+
+async def close_openai_client():
+    """Close the shared OpenAI client, e.g. on application shutdown."""
+    global _openai_client
+    if _openai_client is not None:
+        client, _openai_client = _openai_client, None
+        await client.close()
+
+
+def _cache_key(text: str) -> str:
+    """Hash text into a format cache key."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _cache_get(key: str) -> Optional[str]:
+    """Look up a formatted result, marking it recently used."""
+    cached = _format_cache.get(key)
+    if cached is not None:
+        _format_cache.move_to_end(key)
+    return cached
+
+
+def _cache_put(key: str, formatted_text: str):
+    """Store a formatted result, evicting the oldest entries."""
+    _format_cache[key] = formatted_text
+    while len(_format_cache) > FORMAT_CACHE_MAX_ENTRIES:
+        _format_cache.popitem(last=False)
+
+
+def _needs_formatting(text: str) -> bool:
+    """Whether text is long enough, and not already markdown, to send."""
+    return len(text) >= MIN_FORMAT_LENGTH and "**" not in text
+
+
+def _token_budget(text: str) -> int:
+    """Completion budget for one item; formatting barely grows the text."""
+    return min(len(text) // 2, MAX_TOKENS_PER_ITEM)
+
+
+async def _complete(api_key: str, prompt: str, max_tokens: int) -> str:
+    """Stream one formatting prompt through OpenAI and return the reply text."""
+    client = _get_openai_client(api_key)
+    
+    chunks = []
+    finish_reason = None
+    async with _format_semaphore:
+        stream = await client.chat.completions.create(
+            model="gpt-4o-mini",  # Using mini for cost efficiency
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.3,
+            max_tokens=max_tokens,
+            stream=True,
+        )
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            if chunk.choices[0].delta.content:
+                chunks.append(chunk.choices[0].delta.content)
+            finish_reason = chunk.choices[0].finish_reason or finish_reason
+    
+    if finish_reason == "length":
+        raise _ReplyTruncated("Formatted output was cut off at the token limit")
+    return "".join(chunks).strip()
+
 
 async def format_text_with_llm(text: str) -> str:
     """
@@ -16,46 +139,103 @@ async def format_text_with_llm(text: str) -> str:
     Returns:
         Formatted markdown text
     """
+    if not _needs_formatting(text):
+        return text
+    
+    key = _cache_key(text)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+    
     try:
-        from openai import OpenAI
-        
         api_key = os.getenv("OPENAI_API_KEY")
         if not api_key:
             print("WARNING: OPENAI_API_KEY not set, returning original text")
             return text
         
-        client = OpenAI(api_key=api_key)
+        prompt = f"Text to format:\n{text}"
+        formatted_text = await _complete(api_key, prompt, _token_budget(text))
         
-        prompt = f"""You are a financial analysis text formatter. Format the following text to make it more readable and digestible.
+        _cache_put(key, formatted_text)
+        return formatted_text
+    
+    except Exception as e:
+        print(f"WARNING: Failed to format text with LLM: {e}")
+        return text  # Return original text if formatting fails
 
-Rules:
-1. Use **bold** for key metrics, percentages, dates, and important numbers
-2. Use *italics* for emphasis on important concepts
-3. Break long paragraphs into shorter, digestible chunks
-4. Add bullet points or numbered lists where appropriate
-5. Highlight critical information (price changes, percentages, dates) with **bold**
-6. Keep the original meaning and facts intact
-7. Use markdown formatting only (no HTML)
-8. Make key statistics stand out with **bold**
 
-Text to format:
-{text}
+async def _format_each(texts: list[str], results: list[str], pending: list[int]) -> list[str]:
+    """Format the pending texts with one request each, filling them into results."""
+    formatted = await asyncio.gather(*(format_text_with_llm(texts[i]) for i in pending))
+    for i, formatted_text in zip(pending, formatted):
+        results[i] = formatted_text
+    return results
 
-Return only the formatted markdown text, no explanations:"""
 
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",  # Using mini for cost efficiency
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant that formats financial analysis text to be more readable using markdown."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.3,
-            max_tokens=2000,
-        )
+async def format_texts_batch(texts: list[str]) -> list[str]:
+    """
+    Format several texts with a single OpenAI request.
+    
+    Short, already-formatted and cached texts are resolved locally; the rest are sent in
+    one prompt, delimited by ===ITEM n=== markers. If the reply is cut off at
+    the token limit or cannot be split back into the same items, each text is
+    formatted on its own instead.
+    
+    Args:
+        texts: Plain texts to format
+    
+    Returns:
+        Formatted markdown texts, in input order
+    """
+    results = list(texts)
+    keys = {}
+    for i, text in enumerate(texts):
+        if not _needs_formatting(text):
+            continue
+        key = _cache_key(text)
+        cached = _cache_get(key)
+        if cached is not None:
+            results[i] = cached
+        else:
+            keys[i] = key
+    
+    if not keys:
+        return results
+    if len(keys) == 1:
+        (i,) = keys
+        results[i] = await format_text_with_llm(texts[i])
+        return results
+    
+    try:
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            print("WARNING: OPENAI_API_KEY not set, returning original text")
+            return results
         
-        formatted_text = response.choices[0].message.content.strip()
-        return formatted_text
+        pending = list(keys)
+        items = "\n\n".join(f"===ITEM {n}===\n{texts[i]}" for n, i in enumerate(pending, 1))
+        prompt = f"Format each text independently. Begin each one with its ===ITEM n=== line.\n\n{items}"
+        # Each item also repeats its marker line (a few tokens)
+        budget = sum(_token_budget(texts[i]) + 8 for i in pending)
+        try:
+            reply = await _complete(api_key, prompt, min(budget, MAX_COMPLETION_TOKENS))
+        except _ReplyTruncated:
+            print("WARNING: Batched format reply was cut off, formatting one by one")
+            return await _format_each(texts, results, pending)
+        
+        parts = _ITEM_MARKER_RE.split(reply)
+        # split() yields [preamble, "1", text1, "2", text2, ...]
+        numbers = [int(n) for n in parts[1::2]]
+        if numbers != list(range(1, len(pending) + 1)):
+            print("WARNING: Batched format reply did not match the items, formatting one by one")
+            return await _format_each(texts, results, pending)
         
+        for i, formatted_text in zip(pending, parts[2::2]):
+            formatted_text = formatted_text.strip()
+            _cache_put(keys[i], formatted_text)
+            results[i] = formatted_text
+        return results
+    
     except Exception as e:
-        print(f"WARNING: Failed to format text with LLM: {e}")
-        return text  # Return original text if formatting fails
+        print(f"WARNING: Failed to format texts with LLM: {e}")
+        return results  # Return original texts if formatting fails
@@ -1,12 +1,15 @@
 """Yahoo Finance data service using yfinance library."""
 
+import time
+from collections import OrderedDict
 from datetime import datetime
 from typing import Optional
 
-import pandas as pd
-import yfinance as yf
 from pydantic import BaseModel
 
+from .cache_utils import YF_CACHE_TTL_SECONDS, load_from_cache, save_to_cache_background
+from .http_session import default_date_range, download_closes
+
 
 class TimeSeriesData(BaseModel):
     """Time series data response model."""
@@ -17,6 +20,14 @@ class TimeSeriesData(BaseModel):
     data_type: str = "close"
     
 
+# Windows that reach today are refreshed after YF_CACHE_TTL_SECONDS; windows
+# entirely in the past never change and are kept without expiry
+YF_MEM_CACHE_MAX_ENTRIES = 512
+
+# In-process LRU in front of the file cache: key -> (expires_at, data)
+_MEM: "OrderedDict[tuple[str, str, str], tuple[float, TimeSeriesData]]" = OrderedDict()
+
+
 async def fetch_yahoo_data(
     ticker: str,
     start_date: Optional[str] = None,
@@ -33,30 +44,75 @@ async def fetch_yahoo_data(
     Returns:
         TimeSeriesData with timestamps and closing prices
     """
-    # Default to last 5 years if no dates provided
-    if not start_date:
-        start_date = (datetime.now() - pd.DateOffset(years=5)).strftime("%Y-%m-%d")
-    if not end_date:
-        end_date = datetime.now().strftime("%Y-%m-%d")
-    
-    # Fetch data using yfinance
-    stock = yf.Ticker(ticker)
-    df = stock.history(start=start_date, end=end_date)
-    
-    if df.empty:
-        raise ValueError(f"No data found for ticker: {ticker}")
-    
-    # Reset index to get dates as column
-    df = df.reset_index()
-    
-    # Convert timestamps to ISO format strings
-    timestamps = df["Date"].dt.strftime("%Y-%m-%dT%H:%M:%S").tolist()
-    values = df["Close"].tolist()
-    
-    return TimeSeriesData(
-        ticker=ticker,
-        timestamps=timestamps,
-        values=values,
-        data_type="close"
-    )
+    start_date, end_date = default_date_range(start_date, end_date)
+    
+    key = (ticker, start_date, end_date)
+    now = time.time()
+    entry = _MEM.get(key)
+    if entry is not None and now < entry[0]:
+        _MEM.move_to_end(key)
+        return entry[1]
+    
+    is_historical = end_date < datetime.now().strftime("%Y-%m-%d")
+    ttl = None if is_historical else YF_CACHE_TTL_SECONDS
+    expires_at = float("inf") if ttl is None else now + ttl
+    
+    cache_key = f"yahoo:{ticker}:{start_date}:{end_date}"
+    cached_data = load_from_cache(cache_key, max_age=ttl)
+    if cached_data:
+        result = TimeSeriesData.model_construct(**cached_data)
+        _remember(key, expires_at, result)
+        return result
+    
+    (result,) = await fetch_yahoo_batch([ticker], start_date, end_date)
+    save_to_cache_background(cache_key, result.model_dump())
+    _remember(key, expires_at, result)
+    return result
+
+
+async def fetch_yahoo_batch(
+    tickers: list[str],
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+) -> list[TimeSeriesData]:
+    """
+    Fetch several stocks from Yahoo Finance in one download.
+    
+    Args:
+        tickers: Stock ticker symbols (e.g., ['NVDA', 'AAPL'])
+        start_date: Start date in YYYY-MM-DD format
+        end_date: End date in YYYY-MM-DD format
+        
+    Returns:
+        TimeSeriesData per ticker that returned data, in input order
+    """
+    # Drop duplicates, keeping the first occurrence
+    tickers = list(dict.fromkeys(tickers))
+    if not tickers:
+        return []
+    
+    start_date, end_date = default_date_range(start_date, end_date)
+    closes = await download_closes(tickers, start_date, end_date)
+    if not closes:
+        raise ValueError(f"No data found for ticker: {', '.join(tickers)}")
+    
+    # Built without validation: the fields are plain str/float lists straight
+    # from the NumPy casts in download_closes
+    return [
+        TimeSeriesData.model_construct(
+            ticker=ticker,
+            timestamps=timestamps,
+            values=values,
+            data_type="close"
+        )
+        for ticker, (timestamps, values) in closes.items()
+    ]
+
+
+def _remember(key: tuple[str, str, str], expires_at: float, result: TimeSeriesData):
+    """Store a result in the in-process LRU, evicting the oldest entries."""
+    _MEM[key] = (expires_at, result)
+    _MEM.move_to_end(key)
+    while len(_MEM) > YF_MEM_CACHE_MAX_ENTRIES:
+        _MEM.popitem(last=False)
 
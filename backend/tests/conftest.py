@@ -0,0 +1,6 @@
+"""Make the backend's `services` package importable, as main.py imports it."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
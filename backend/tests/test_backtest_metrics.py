@@ -0,0 +1,58 @@
+"""Tests for the backtest error metrics."""
+
+import numpy as np
+import pytest
+
+from services.backtest_service import _ErrorMetrics, calculate_mae, calculate_mape
+
+
+def test_empty_input_gives_zero_metrics():
+    metrics = _ErrorMetrics()
+    metrics.add([], [])
+    
+    assert metrics.points == 0
+    assert metrics.mape == 0.0
+    assert metrics.mae == 0.0
+    assert calculate_mape([], []) == 0.0
+    assert calculate_mae([], []) == 0.0
+
+
+def test_all_zero_actuals_leave_mape_undefined():
+    metrics = _ErrorMetrics()
+    metrics.add([0.0, 0.0], [1.0, -3.0])
+    
+    assert metrics.mape == 0.0
+    assert metrics.mae == pytest.approx(2.0)
+
+
+def test_zero_actuals_are_left_out_of_mape_only():
+    metrics = _ErrorMetrics()
+    metrics.add([0.0, 10.0], [1.0, 9.0])
+    
+    assert metrics.mape == pytest.approx(10.0)
+    assert metrics.mae == pytest.approx(1.0)
+
+
+def test_mismatched_lengths_raise():
+    metrics = _ErrorMetrics()
+    with pytest.raises(ValueError):
+        metrics.add([1.0, 2.0], [1.0])
+    with pytest.raises(ValueError):
+        calculate_mape([1.0, 2.0], [1.0])
+    with pytest.raises(ValueError):
+        calculate_mae([1.0], [1.0, 2.0])
+
+
+def test_batches_add_up_to_the_whole_series():
+    rng = np.random.default_rng(0)
+    actual = rng.uniform(1.0, 100.0, 50)
+    forecast = actual + rng.normal(0.0, 5.0, 50)
+    
+    metrics = _ErrorMetrics()
+    for lo in range(0, 50, 8):
+        metrics.add(actual[lo:lo + 8], forecast[lo:lo + 8])
+    
+    assert metrics.points == 50
+    assert metrics.mape == pytest.approx(calculate_mape(actual, forecast))
+    assert metrics.mae == pytest.approx(calculate_mae(actual, forecast))
+    assert metrics.mae == pytest.approx(np.abs(actual - forecast).mean())
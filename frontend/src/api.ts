@@ -14,9 +14,26 @@ import type {
   BacktestRequest,
   CriticalEventsResult,
   CriticalEventsRequest,
+  JobCreated,
+  JobStatus,
 } from './types';
 
 const API_BASE = '/api';
+const JOB_POLL_INTERVAL_MS = 500;
+const JOB_TIMEOUT_MS = 5 * 60 * 1000;
+
+// Poll a background job until it completes, fails or times out
+async function waitForJob<T>(jobId: string): Promise<T> {
+  const deadline = Date.now() + JOB_TIMEOUT_MS;
+  while (Date.now() < deadline) {
+    const response = await axios.get<JobStatus<T>>(`${API_BASE}/jobs/${jobId}`);
+    const job = response.data;
+    if (job.status === 'completed') return job.result as T;
+    if (job.status === 'failed') throw new Error(job.error ?? 'Job failed');
+    await new Promise((resolve) => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+  }
+  throw new Error(`Job ${jobId} did not finish within ${JOB_TIMEOUT_MS / 1000} seconds`);
+}
 
 // Yahoo Finance API
 export async function fetchYahooData(
@@ -106,8 +123,8 @@ export async function fetchForexData(
 export async function searchTimeSeriesEvent(
   request: SearchRequest
 ): Promise<SearchResult> {
-  const response = await axios.post<SearchResult>(`${API_BASE}/search`, request);
-  return response.data;
+  const response = await axios.post<JobCreated>(`${API_BASE}/search`, request);
+  return waitForJob<SearchResult>(response.data.job_id);
 }
 
 // Backtest API
@@ -122,7 +139,7 @@ export async function runBacktest(
 export async function searchCriticalEvents(
   request: CriticalEventsRequest
 ): Promise<CriticalEventsResult> {
-  const response = await axios.post<CriticalEventsResult>(`${API_BASE}/critical-events`, request);
-  return response.data;
+  const response = await axios.post<JobCreated>(`${API_BASE}/critical-events`, request);
+  return waitForJob<CriticalEventsResult>(response.data.job_id);
 }
 
@@ -167,3 +167,17 @@ export interface CriticalEventsRequest {
   num_events?: number;
 }
 
+// Background job types
+export type JobState = 'pending' | 'completed' | 'failed';
+
+export interface JobCreated {
+  job_id: string;
+  status: JobState;
+}
+
+export interface JobStatus<T> {
+  job_id: string;
+  status: JobState;
+  result: T | null;
+  error: string | null;
+}